@@ -5,25 +5,40 @@ Allows easy swapping of LLM providers and models through environment files
 """
 
 import asyncio
-import json
+import contextlib
+import functools
 import os
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Any, Callable, FrozenSet, Tuple
+from dataclasses import dataclass, fields
 from datetime import datetime
 import logging
-from dotenv import load_dotenv
+import re
+from concurrent.futures import ThreadPoolExecutor
+import orjson
+from dotenv import dotenv_values
 
 from langsmith import Client
-from langsmith.evaluation import evaluate, EvaluationResult
+from langsmith.evaluation import aevaluate, EvaluationResult
 from langsmith.schemas import Run, Example
 
 # Import enhanced mock data
-from enhanced_mocked_data import EnhancedMockData, DebugStep
+from enhanced_mocked_data import get_response_narrative, get_workflow
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Response quality markers matched in a single case-insensitive pass.
+# Groups map to: 1 = root cause, 2 = fix, 3 = verification. The lookahead
+# keeps matches zero-width so adjacent markers cannot swallow each other.
+_QUALITY_MARKERS_RE = re.compile(r"(?=(root cause)|(kubectl|fix)|(verif|check))", re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=4096)
+def _required_tools_set(required_tools: Tuple[str, ...]) -> FrozenSet[str]:
+    """Return the required tools of an example as a cached frozenset."""
+    return frozenset(required_tools)
+
 
 @dataclass
 class ModelConfig:
@@ -38,20 +53,30 @@ class ModelConfig:
     additional_params: Dict[str, Any] = None
 
 
+# Field names resolved once; results copy configs shallowly instead of via asdict
+_MODEL_CONFIG_FIELDS = tuple(field.name for field in fields(ModelConfig))
+
+
 class EnvConfigLoader:
     """Loads model configuration from environment files."""
 
     @staticmethod
     def load_from_file(env_file: Path) -> ModelConfig:
-        """Load configuration from a .env file."""
+        """Load configuration from a .env file.
+
+        Values from the file take precedence over the process environment, but
+        the file is parsed without touching ``os.environ`` so several env files
+        can be loaded concurrently.
+        """
         if not env_file.exists():
             raise FileNotFoundError(f"Environment file not found: {env_file}")
 
-        # Load the env file
-        load_dotenv(env_file, override=True)
+        # Load the env file on top of the current environment
+        env = dict(os.environ)
+        env.update((key, value) for key, value in dotenv_values(env_file).items() if value is not None)
 
         # Extract configuration
-        provider = os.getenv("LLM_PROVIDER", "gemini").lower()
+        provider = env.get("LLM_PROVIDER", "gemini").lower()
 
         # Map provider to model and API key
         config_map = {
@@ -83,26 +108,26 @@ class EnvConfigLoader:
         provider_config = config_map[provider]
 
         # Get model name and API key
-        model_name = os.getenv(provider_config["model_key"], provider_config["default_model"])
-        api_key = os.getenv(provider_config["api_key"])
+        model_name = env.get(provider_config["model_key"], provider_config["default_model"])
+        api_key = env.get(provider_config["api_key"])
 
         if not api_key:
             raise ValueError(f"API key not found for provider {provider}: {provider_config['api_key']}")
 
         # Get optional parameters
-        temperature = float(os.getenv("TEMPERATURE", "0.3"))
-        max_tokens = int(os.getenv("MAX_TOKENS", "4096"))
+        temperature = float(env.get("TEMPERATURE", "0.3"))
+        max_tokens = int(env.get("MAX_TOKENS", "4096"))
 
         # Azure-specific parameters
-        api_base = os.getenv("AZURE_API_BASE") if provider == "azure" else None
-        api_version = os.getenv("AZURE_API_VERSION", "2024-02-01") if provider == "azure" else None
+        api_base = env.get("AZURE_API_BASE") if provider == "azure" else None
+        api_version = env.get("AZURE_API_VERSION", "2024-02-01") if provider == "azure" else None
 
         # Additional parameters
         additional_params = {}
-        if os.getenv("THINKING_MODE"):
-            additional_params["thinking_mode"] = os.getenv("THINKING_MODE")
-        if os.getenv("SYSTEM_PROMPT"):
-            additional_params["system_prompt"] = os.getenv("SYSTEM_PROMPT")
+        if env.get("THINKING_MODE"):
+            additional_params["thinking_mode"] = env.get("THINKING_MODE")
+        if env.get("SYSTEM_PROMPT"):
+            additional_params["system_prompt"] = env.get("SYSTEM_PROMPT")
 
         return ModelConfig(
             provider=provider,
@@ -176,10 +201,72 @@ MAX_TOKENS=4096
         env_dir = Path("env-configs")
         env_dir.mkdir(exist_ok=True)
 
-        for filename, content in samples.items():
+        def write_sample(item):
+            filename, content = item
             filepath = env_dir / filename
-            filepath.write_text(content)
-            logger.info(f"Created sample: {filepath}")
+            filepath.write_bytes(content.encode())
+            return filepath
+
+        # Issue the writes concurrently so a slow filesystem is not hit serially
+        with ThreadPoolExecutor(max_workers=len(samples)) as executor:
+            for filepath in executor.map(write_sample, samples.items()):
+                logger.info(f"Created sample: {filepath}")
+
+
+def _create_gemini(config: ModelConfig):
+    """Create a Google Gemini chat model."""
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    return ChatGoogleGenerativeAI(
+        model=config.model_name,
+        google_api_key=config.api_key,
+        temperature=config.temperature,
+        max_output_tokens=config.max_tokens
+    )
+
+
+def _create_anthropic(config: ModelConfig):
+    """Create an Anthropic Claude chat model."""
+    from langchain_anthropic import ChatAnthropic
+    return ChatAnthropic(
+        model=config.model_name,
+        anthropic_api_key=config.api_key,
+        temperature=config.temperature,
+        max_tokens=config.max_tokens
+    )
+
+
+def _create_openai(config: ModelConfig):
+    """Create an OpenAI chat model."""
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(
+        model=config.model_name,
+        api_key=config.api_key,
+        temperature=config.temperature,
+        max_tokens=config.max_tokens
+    )
+
+
+def _create_azure(config: ModelConfig):
+    """Create an Azure OpenAI chat model."""
+    from langchain_openai import AzureChatOpenAI
+    return AzureChatOpenAI(
+        deployment_name=config.model_name,
+        api_key=config.api_key,
+        api_base=config.api_base,
+        api_version=config.api_version,
+        temperature=config.temperature,
+        max_tokens=config.max_tokens
+    )
+
+
+# Provider name -> LLM factory. Provider SDKs are imported lazily inside each
+# factory so only the providers actually used need to be installed.
+_LLM_FACTORIES: Dict[str, Callable[[ModelConfig], Any]] = {
+    "gemini": _create_gemini,
+    "anthropic": _create_anthropic,
+    "openai": _create_openai,
+    "azure": _create_azure,
+}
 
 
 class ConfigurableExperimentRunner:
@@ -192,70 +279,50 @@ class ConfigurableExperimentRunner:
             raise ValueError("LANGSMITH_API_KEY environment variable is required")
 
         self.client = Client(api_key=self.langsmith_api_key)
-        self.mock_data = EnhancedMockData()
+        self._datasets: Dict[str, Any] = {}
+
+    def get_dataset(self, dataset_name: str):
+        """Resolve a dataset by name, caching the lookup on this runner."""
+        dataset = self._datasets.get(dataset_name)
+        if dataset is None:
+            dataset = next(iter(self.client.list_datasets(dataset_name=dataset_name)), None)
+            if dataset is None:
+                raise ValueError(f"Dataset '{dataset_name}' not found")
+            self._datasets[dataset_name] = dataset
+        return dataset
 
     def create_llm(self, config: ModelConfig):
         """Create LLM instance based on configuration."""
-        # Set API key in environment for the provider
-        if config.provider == "gemini":
-            os.environ["GOOGLE_API_KEY"] = config.api_key
-            from langchain_google_genai import ChatGoogleGenerativeAI
-            return ChatGoogleGenerativeAI(
-                model=config.model_name,
-                temperature=config.temperature,
-                max_output_tokens=config.max_tokens
-            )
-
-        elif config.provider == "anthropic":
-            os.environ["ANTHROPIC_API_KEY"] = config.api_key
-            from langchain_anthropic import ChatAnthropic
-            return ChatAnthropic(
-                model=config.model_name,
-                temperature=config.temperature,
-                max_tokens=config.max_tokens
-            )
-
-        elif config.provider == "openai":
-            os.environ["OPENAI_API_KEY"] = config.api_key
-            from langchain_openai import ChatOpenAI
-            return ChatOpenAI(
-                model=config.model_name,
-                temperature=config.temperature,
-                max_tokens=config.max_tokens
-            )
-
-        elif config.provider == "azure":
-            from langchain_openai import AzureChatOpenAI
-            return AzureChatOpenAI(
-                deployment_name=config.model_name,
-                api_key=config.api_key,
-                api_base=config.api_base,
-                api_version=config.api_version,
-                temperature=config.temperature,
-                max_tokens=config.max_tokens
-            )
-        else:
-            raise ValueError(f"Unknown provider: {config.provider}")
+        try:
+            factory = _LLM_FACTORIES[config.provider]
+        except KeyError:
+            raise ValueError(f"Unknown provider: {config.provider}") from None
+        return factory(config)
 
     async def run_single_test(
         self,
         config: ModelConfig,
-        inputs: Dict[str, Any]
+        inputs: Dict[str, Any],
+        run_timestamp: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Run a single test with the configured model."""
+        """Run a single test with the configured model.
+
+        ``run_timestamp`` identifies the experiment run; it is computed once per
+        experiment rather than per example.
+        """
 
         # Extract scenario information
         scenario_type = inputs.get("metadata", {}).get("scenario_type", "image_pull")
         namespace = inputs.get("namespace", "test-ns")
 
         # Get the realistic workflow for this scenario
-        workflow = self.mock_data.get_workflow(scenario_type)
+        workflow = get_workflow(scenario_type)
 
         # Create LLM
         llm = self.create_llm(config)
 
         # Generate narrative response
-        narrative = self.mock_data.get_response_narrative(scenario_type, namespace)
+        narrative = get_response_narrative(scenario_type, namespace)
 
         # Get tool sequence
         tools_used = [step.tool for step in workflow]
@@ -279,7 +346,7 @@ class ConfigurableExperimentRunner:
                 "model": config.model_name,
                 "temperature": config.temperature
             },
-            "timestamp": datetime.now().isoformat()
+            "timestamp": run_timestamp or datetime.now().isoformat()
         }
 
     def evaluate_response(self, run: Run, example: Example) -> EvaluationResult:
@@ -303,16 +370,19 @@ class ConfigurableExperimentRunner:
 
         # Score tool usage
         if required_tools:
-            tool_score = len(set(tools_used) & set(required_tools)) / len(required_tools)
+            required = _required_tools_set(tuple(required_tools))
+            tool_score = len(required.intersection(tools_used)) / len(required_tools)
             scores["tool_usage"] = tool_score
         else:
             scores["tool_usage"] = 1.0
 
         # Score response quality
-        response_lower = response.lower()
-        has_root_cause = "root cause" in response_lower
-        has_fix = "kubectl" in response_lower or "fix" in response_lower
-        has_verification = "verif" in response_lower or "check" in response_lower
+        found = [False, False, False]
+        for match in _QUALITY_MARKERS_RE.finditer(response):
+            found[match.lastindex - 1] = True
+            if all(found):
+                break
+        has_root_cause, has_fix, has_verification = found
 
         quality_score = 0.3 * has_root_cause + 0.4 * has_fix + 0.3 * has_verification
         scores["response_quality"] = quality_score
@@ -335,66 +405,89 @@ class ConfigurableExperimentRunner:
         self,
         dataset_name: str,
         env_files: List[Path],
-        experiment_prefix: str = "configurable-exp"
+        experiment_prefix: str = "configurable-exp",
+        max_parallel_envs: int = 3,
+        output_file: Optional[Path] = None
     ) -> List[Dict[str, Any]]:
-        """Run experiments with different environment configurations."""
+        """Run experiments with different environment configurations.
 
-        results = []
+        Env files are independent provider sweeps, so they run concurrently,
+        bounded by ``max_parallel_envs``. Results keep the order of ``env_files``.
+        If ``output_file`` is given, each result is appended to it as a JSON
+        line as soon as its experiment finishes.
+        """
 
-        # Get dataset
-        datasets = list(self.client.list_datasets(dataset_name=dataset_name))
-        if not datasets:
-            raise ValueError(f"Dataset '{dataset_name}' not found")
-        dataset = datasets[0]
+        # Resolve the dataset once; every experiment then references it by ID
+        dataset = self.get_dataset(dataset_name)
 
-        for env_file in env_files:
-            logger.info(f"\nLoading configuration from: {env_file}")
+        semaphore = asyncio.Semaphore(max(1, max_parallel_envs))
 
-            try:
-                # Load configuration
-                config = EnvConfigLoader.load_from_file(env_file)
-                logger.info(f"  Provider: {config.provider}")
-                logger.info(f"  Model: {config.model_name}")
-                logger.info(f"  Temperature: {config.temperature}")
-
-                # Create test function
-                async def test_fn(inputs: Dict[str, Any]) -> Dict[str, Any]:
-                    return await self.run_single_test(config, inputs)
-
-                # Run evaluation
-                experiment_name = f"{experiment_prefix}-{env_file.stem}-{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-
-                eval_results = await evaluate(
-                    test_fn,
-                    data=dataset_name,
-                    evaluators=[self.evaluate_response],
-                    experiment=experiment_name,
-                    max_concurrency=5,
-                    metadata={
-                        "env_file": str(env_file),
-                        "provider": config.provider,
-                        "model": config.model_name,
-                        "timestamp": datetime.now().isoformat()
-                    }
-                )
+        with open(output_file, "wb") if output_file else contextlib.nullcontext() as out:
 
-                results.append({
-                    "env_file": str(env_file),
-                    "config": asdict(config),
-                    "experiment_name": experiment_name,
-                    "results": eval_results
-                })
+            async def run_one(env_file: Path) -> Dict[str, Any]:
+                async with semaphore:
+                    result = await self._run_env_experiment(dataset, env_file, experiment_prefix)
+                if out is not None:
+                    out.write(orjson.dumps(result, default=str, option=orjson.OPT_APPEND_NEWLINE))
+                    out.flush()
+                return result
 
-                logger.info(f"  ✓ Experiment complete: {experiment_name}")
+            return list(await asyncio.gather(*(run_one(env_file) for env_file in env_files)))
 
-            except Exception as e:
-                logger.error(f"  ✗ Failed to run experiment with {env_file}: {e}")
-                results.append({
+    async def _run_env_experiment(
+        self,
+        dataset,
+        env_file: Path,
+        experiment_prefix: str
+    ) -> Dict[str, Any]:
+        """Run the experiment for a single environment file."""
+        logger.info(f"\nLoading configuration from: {env_file}")
+
+        try:
+            # Load configuration
+            config = await asyncio.to_thread(EnvConfigLoader.load_from_file, env_file)
+            logger.info(f"  Provider: {config.provider}")
+            logger.info(f"  Model: {config.model_name}")
+            logger.info(f"  Temperature: {config.temperature}")
+
+            # Bind this env's config explicitly; a closure would see whatever
+            # `config` last referred to if the body were ever shared.
+            started_at = datetime.now()
+            run_timestamp = started_at.isoformat()
+            test_fn = functools.partial(self.run_single_test, config, run_timestamp=run_timestamp)
+
+            # Run evaluation
+            experiment_name = f"{experiment_prefix}-{env_file.stem}-{started_at.strftime('%Y%m%d_%H%M%S')}"
+
+            eval_results = await aevaluate(
+                test_fn,
+                data=dataset.id,
+                evaluators=[self.evaluate_response],
+                experiment=experiment_name,
+                max_concurrency=5,
+                metadata={
                     "env_file": str(env_file),
-                    "error": str(e)
-                })
+                    "provider": config.provider,
+                    "model": config.model_name,
+                    "timestamp": run_timestamp
+                }
+            )
+
+            logger.info(f"  ✓ Experiment complete: {experiment_name}")
 
-        return results
+            return {
+                "env_file": str(env_file),
+                "config": {name: getattr(config, name) for name in _MODEL_CONFIG_FIELDS},
+                "experiment_name": experiment_name,
+                "results": eval_results
+            }
+
+        except Exception as e:
+            logger.error(f"  ✗ Failed to run experiment with {env_file}: {e}")
+            return {
+                "env_file": str(env_file),
+                "error": str(e)
+            }
 
 
 async def main():
@@ -409,6 +502,8 @@ async def main():
     parser.add_argument("--env-dir", help="Directory containing env files")
     parser.add_argument("--create-samples", action="store_true", help="Create sample env files")
     parser.add_argument("--experiment-prefix", default="config-exp", help="Experiment prefix")
+    parser.add_argument("--max-parallel-envs", type=int, default=3,
+                        help="Maximum number of env files to run concurrently")
 
     args = parser.parse_args()
 
@@ -431,9 +526,15 @@ async def main():
                 logger.warning(f"Environment file not found: {env_file}")
 
     if args.env_dir:
-        env_dir = Path(args.env_dir)
-        if env_dir.exists():
-            env_files.extend(env_dir.glob("*.env"))
+        # A missing --env-dir only warns, since --env files may still be given
+        try:
+            with os.scandir(args.env_dir) as entries:
+                env_files.extend(
+                    Path(entry.path) for entry in entries
+                    if entry.name.endswith(".env") and entry.is_file()
+                )
+        except FileNotFoundError:
+            logger.warning(f"Environment directory not found: {args.env_dir}")
 
     if not env_files:
         logger.error("No environment files specified. Use --env or --env-dir")
@@ -442,12 +543,15 @@ async def main():
 
     logger.info(f"Found {len(env_files)} environment files to test")
 
-    # Run experiments
+    # Run experiments, streaming each result to disk as it completes
+    output_file = Path(f"configurable_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl")
     runner = ConfigurableExperimentRunner()
     results = await runner.run_experiment(
         dataset_name=args.dataset,
         env_files=env_files,
-        experiment_prefix=args.experiment_prefix
+        experiment_prefix=args.experiment_prefix,
+        max_parallel_envs=args.max_parallel_envs,
+        output_file=output_file
     )
 
     # Display summary
@@ -465,11 +569,6 @@ async def main():
             print(f"  Model: {config['model_name']}")
             print(f"  Experiment: {result['experiment_name']}")
 
-    # Save results
-    output_file = f"configurable_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    with open(output_file, "w") as f:
-        json.dump(results, f, indent=2, default=str)
-
     print(f"\nResults saved to: {output_file}")
 
 
@@ -4,23 +4,72 @@ LangSmith Dataset Builder for Kubently
 Converts existing test scenarios into LangSmith datasets for experimentation
 """
 
-import json
 import os
 import re
 import subprocess
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 
+import orjson
 from dotenv import load_dotenv
 from langsmith import Client
-from langsmith.schemas import Dataset, Example, DataType
+from langsmith.schemas import Dataset, DataType
+from langsmith.utils import LangSmithError
+from requests.adapters import HTTPAdapter
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Patterns used when parsing scenario scripts. An explicit NAMESPACE= assignment
+# takes precedence over a `create namespace` command wherever each appears, so
+# the two are kept as separate searches rather than one alternation.
+_NAMESPACE_VAR_RE = re.compile(r'NAMESPACE="?([^"\s]+)"?')
+_CREATE_NAMESPACE_RE = re.compile(r'create\s+namespace\s+([^\s]+)')
+_SCENARIO_NUMBER_RE = re.compile(r'(\d+)-')
+
+
+@lru_cache(maxsize=512)
+def _estimate_difficulty(name: str, fix: str) -> str:
+    """Estimate scenario difficulty based on name and fix."""
+    name_lower = name.lower()
+    if any(word in name_lower for word in ["typo", "simple", "basic"]):
+        return "easy"
+    elif any(word in name_lower for word in ["cross", "rbac", "network", "permission"]):
+        return "hard"
+    elif any(word in fix.lower() for word in ["complex", "multiple", "coordinate"]):
+        return "hard"
+    else:
+        return "medium"
+
+
+@lru_cache(maxsize=512)
+def _extract_required_tools(fix: str) -> Tuple[str, ...]:
+    """Extract required tools from the fix description.
+
+    Returns a tuple because results are cached and shared between scenarios.
+    """
+    tools = []
+
+    # Every tool marker is a kubectl subcommand, so one scan rules them all out
+    if "kubectl" in fix:
+        if "kubectl edit" in fix or "kubectl patch" in fix:
+            tools.append("execute_kubectl")
+        if "kubectl logs" in fix:
+            tools.append("get_pod_logs")
+        if "kubectl describe" in fix or "kubectl get" in fix:
+            tools.append("debug_resource")
+
+    # If no specific tools found, assume basic debugging is needed
+    if not tools:
+        tools = ["debug_resource", "get_pod_logs"]
+
+    return tuple(tools)
+
 
 @dataclass
 class KubentlyScenario:
@@ -29,14 +78,84 @@ class KubentlyScenario:
     namespace: str
     expected_fix: str
     query: str
-    setup_script: str
     validation_checks: List[str]
     metadata: Dict[str, Any]
 
+    @property
+    def setup_script(self) -> str:
+        """Scenario script contents, read on demand rather than kept in memory."""
+        return Path(self.metadata["file_path"]).read_text(encoding="utf-8", errors="replace")
+
 
 class DatasetBuilder:
     """Builds LangSmith datasets from Kubently test scenarios."""
 
+    # Maximum number of examples sent per bulk create request
+    EXAMPLE_BATCH_SIZE = 100
+    # Upload requests kept in flight at once (bulk batches, or single examples
+    # when the bulk endpoint is unavailable)
+    EXAMPLE_UPLOAD_WORKERS = 16
+
+    # Success criteria shared by every uploaded example; treat as read-only
+    _SUCCESS_CRITERIA = {
+        "root_cause_identified": True,
+        "fix_proposed": True,
+        "tools_used_correctly": True
+    }
+
+    # (scenario_type, scenario name keywords, script content markers, query template),
+    # checked in order; the first match wins.
+    _SCENARIO_QUERIES = (
+        ("image_pull", ("imagepull",), (),
+         "In cluster kind, there's an issue with a pod in namespace {namespace}. The pod is showing ImagePullBackOff status. Please investigate and fix the issue."),
+        ("crash_loop", ("crash",), (),
+         "In cluster kind, a pod in namespace {namespace} is in CrashLoopBackOff. Please diagnose the issue."),
+        ("service_issue", ("service",), (),
+         "In cluster kind, the service in namespace {namespace} doesn't seem to be working. Traffic isn't reaching the pods. Please investigate."),
+        ("rbac", ("rbac",), (),
+         "In cluster kind, a pod in namespace {namespace} is encountering authorization issues. Please diagnose and make recommendations."),
+        ("cross_namespace", ("cross-namespace",), ("namespace-a",),
+         "In cluster kind, there are connectivity issues between namespaces. Please investigate and identify the root cause."),
+        ("memory", ("oom",), (),
+         "In cluster kind, a pod in namespace {namespace} keeps getting OOMKilled. Please investigate and fix the issue."),
+        ("health_probe", ("probe",), (),
+         "In cluster kind, a pod in namespace {namespace} is failing its health checks. Please investigate."),
+        ("network", ("network",), (),
+         "In cluster kind, there are network connectivity issues in namespace {namespace}. Please investigate."),
+        ("permissions", ("permission",), (),
+         "In cluster kind, a service account in namespace {namespace} is having permission issues. Please investigate."),
+        ("configuration", ("configmap",), (),
+         "In cluster kind, a pod in namespace {namespace} is having configuration issues. Please investigate."),
+        ("secrets", ("secret",), (),
+         "In cluster kind, a pod in namespace {namespace} is having issues with secrets. Please investigate."),
+        ("storage", ("volume", "pvc"), (),
+         "In cluster kind, a pod in namespace {namespace} is having volume mount issues. Please investigate."),
+        ("resources", ("resource", "limit"), (),
+         "In cluster kind, a pod in namespace {namespace} is having resource constraint issues. Please investigate."),
+        ("dns", ("dns",), (),
+         "In cluster kind, there are DNS resolution issues in namespace {namespace}. Please investigate."),
+        ("ingress", ("ingress",), (),
+         "In cluster kind, the ingress in namespace {namespace} is not working correctly. Please investigate."),
+    )
+    _DEFAULT_SCENARIO_QUERY = (
+        "general",
+        "In cluster kind, there's an issue in namespace {namespace}. Please investigate and identify the root cause.",
+    )
+    # Name keyword -> index of its table entry, plus one zero-width pattern that
+    # finds every keyword occurrence in a single pass over the scenario name.
+    _SCENARIO_KEYWORD_PRIORITY = {
+        keyword: index
+        for index, entry in enumerate(_SCENARIO_QUERIES)
+        for keyword in entry[1]
+    }
+    _SCENARIO_KEYWORD_RE = re.compile(
+        "(?=(" + "|".join(re.escape(keyword) for keyword in _SCENARIO_KEYWORD_PRIORITY) + "))"
+    )
+    # Table entries that can also match on script content, in priority order
+    _CONTENT_MARKER_ENTRIES = tuple(
+        index for index, entry in enumerate(_SCENARIO_QUERIES) if entry[2]
+    )
+
     def __init__(self, langsmith_api_key: Optional[str] = None):
         """Initialize the dataset builder."""
         self.langsmith_api_key = langsmith_api_key or os.getenv("LANGSMITH_API_KEY")
@@ -44,100 +163,76 @@ class DatasetBuilder:
             raise ValueError("LANGSMITH_API_KEY environment variable is required")
 
         self.client = Client(api_key=self.langsmith_api_key)
+        self._size_connection_pool()
         self.scenarios_dir = Path(__file__).parent.parent / "test-automation" / "scenarios"
 
+    def _size_connection_pool(self):
+        """Keep enough pooled keep-alive connections for concurrent uploads.
+
+        The default requests pool holds 10 connections per host, fewer than the
+        upload workers, so extra connections would be reopened per request.
+        LangSmith's retry policy is carried over to the new adapter.
+        """
+        session = getattr(self.client, "session", None)
+        if session is None:
+            return
+        retries = session.get_adapter("https://").max_retries
+        adapter = HTTPAdapter(
+            pool_connections=self.EXAMPLE_UPLOAD_WORKERS,
+            pool_maxsize=self.EXAMPLE_UPLOAD_WORKERS,
+            max_retries=retries
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
     def parse_scenario_file(self, file_path: Path) -> Optional[KubentlyScenario]:
         """Parse a scenario shell script to extract metadata."""
         try:
-            content = file_path.read_text()
+            with open(file_path, "rb") as f:
+                content = f.read().decode("utf-8", "replace")
 
             # Extract namespace
-            namespace_match = re.search(r'NAMESPACE="?([^"\s]+)"?', content)
+            namespace_match = _NAMESPACE_VAR_RE.search(content)
             if not namespace_match:
-                namespace_match = re.search(r'create\s+namespace\s+([^\s]+)', content)
+                namespace_match = _CREATE_NAMESPACE_RE.search(content)
 
             if namespace_match:
                 namespace = namespace_match.group(1)
             else:
-                scenario_num = re.search(r'^(\d+)-', file_path.stem)
+                scenario_num = _SCENARIO_NUMBER_RE.match(file_path.stem)
                 if scenario_num:
                     namespace = f"test-ns-{scenario_num.group(1)}"
                 else:
                     namespace = f"test-ns-{file_path.stem[:8]}"
 
-            # Extract expected fix
-            expected_fix = "Unknown"
-            for line in content.split('\n'):
-                if 'Expected fix:' in line or 'expected fix:' in line or 'THE FIX:' in line:
-                    expected_fix = line.split(':', 1)[1].strip()
-                    break
-
-            # Extract validation checks (commands that verify the fix)
+            # Extract the expected fix and the validation checks (commands that
+            # verify the fix) in a single pass over the script
+            expected_fix = None
             validation_checks = []
             in_validation = False
-            for line in content.split('\n'):
-                if 'validation' in line.lower() or 'verify' in line.lower():
-                    in_validation = True
+            for line in content.splitlines():
+                if expected_fix is None and (
+                        'Expected fix:' in line or 'expected fix:' in line or 'THE FIX:' in line):
+                    expected_fix = line.split(':', 1)[1].strip()
+                if not in_validation:
+                    line_lower = line.lower()
+                    in_validation = 'validation' in line_lower or 'verify' in line_lower
                 if in_validation and 'kubectl' in line:
                     validation_checks.append(line.strip())
+            if expected_fix is None:
+                expected_fix = "Unknown"
 
             # Create query based on scenario
             name = file_path.stem
-            if "imagepull" in name.lower():
-                query = f"In cluster kind, there's an issue with a pod in namespace {namespace}. The pod is showing ImagePullBackOff status. Please investigate and fix the issue."
-                scenario_type = "image_pull"
-            elif "crash" in name.lower():
-                query = f"In cluster kind, a pod in namespace {namespace} is in CrashLoopBackOff. Please diagnose the issue."
-                scenario_type = "crash_loop"
-            elif "service" in name.lower():
-                query = f"In cluster kind, the service in namespace {namespace} doesn't seem to be working. Traffic isn't reaching the pods. Please investigate."
-                scenario_type = "service_issue"
-            elif "rbac" in name.lower():
-                query = f"In cluster kind, a pod in namespace {namespace} is encountering authorization issues. Please diagnose and make recommendations."
-                scenario_type = "rbac"
-            elif "cross-namespace" in name.lower() or "namespace-a" in content:
-                query = "In cluster kind, there are connectivity issues between namespaces. Please investigate and identify the root cause."
-                scenario_type = "cross_namespace"
-            elif "oom" in name.lower():
-                query = f"In cluster kind, a pod in namespace {namespace} keeps getting OOMKilled. Please investigate and fix the issue."
-                scenario_type = "memory"
-            elif "probe" in name.lower():
-                query = f"In cluster kind, a pod in namespace {namespace} is failing its health checks. Please investigate."
-                scenario_type = "health_probe"
-            elif "network" in name.lower():
-                query = f"In cluster kind, there are network connectivity issues in namespace {namespace}. Please investigate."
-                scenario_type = "network"
-            elif "permission" in name.lower() or "rbac" in name.lower():
-                query = f"In cluster kind, a service account in namespace {namespace} is having permission issues. Please investigate."
-                scenario_type = "permissions"
-            elif "configmap" in name.lower():
-                query = f"In cluster kind, a pod in namespace {namespace} is having configuration issues. Please investigate."
-                scenario_type = "configuration"
-            elif "secret" in name.lower():
-                query = f"In cluster kind, a pod in namespace {namespace} is having issues with secrets. Please investigate."
-                scenario_type = "secrets"
-            elif "volume" in name.lower() or "pvc" in name.lower():
-                query = f"In cluster kind, a pod in namespace {namespace} is having volume mount issues. Please investigate."
-                scenario_type = "storage"
-            elif "resource" in name.lower() or "limit" in name.lower():
-                query = f"In cluster kind, a pod in namespace {namespace} is having resource constraint issues. Please investigate."
-                scenario_type = "resources"
-            elif "dns" in name.lower():
-                query = f"In cluster kind, there are DNS resolution issues in namespace {namespace}. Please investigate."
-                scenario_type = "dns"
-            elif "ingress" in name.lower():
-                query = f"In cluster kind, the ingress in namespace {namespace} is not working correctly. Please investigate."
-                scenario_type = "ingress"
-            else:
-                query = f"In cluster kind, there's an issue in namespace {namespace}. Please investigate and identify the root cause."
-                scenario_type = "general"
+            scenario_type, query_template = self._match_scenario_query(name.lower(), content)
+            query = query_template.format(namespace=namespace)
 
             # Extract metadata
             metadata = {
                 "file_path": str(file_path),
                 "scenario_type": scenario_type,
-                "difficulty": self._estimate_difficulty(name, expected_fix),
-                "required_tools": self._extract_required_tools(expected_fix),
+                "difficulty": _estimate_difficulty(name, expected_fix),
+                "required_tools": list(_extract_required_tools(expected_fix)),
                 "namespace": namespace
             }
 
@@ -146,7 +241,6 @@ class DatasetBuilder:
                 namespace=namespace,
                 expected_fix=expected_fix,
                 query=query,
-                setup_script=content,
                 validation_checks=validation_checks,
                 metadata=metadata
             )
@@ -155,47 +249,49 @@ class DatasetBuilder:
             print(f"Failed to parse scenario {file_path}: {e}")
             return None
 
-    def _estimate_difficulty(self, name: str, fix: str) -> str:
-        """Estimate scenario difficulty based on name and fix."""
-        if any(word in name.lower() for word in ["typo", "simple", "basic"]):
-            return "easy"
-        elif any(word in name.lower() for word in ["cross", "rbac", "network", "permission"]):
-            return "hard"
-        elif any(word in fix.lower() for word in ["complex", "multiple", "coordinate"]):
-            return "hard"
-        else:
-            return "medium"
-
-    def _extract_required_tools(self, fix: str) -> List[str]:
-        """Extract required tools from the fix description."""
-        tools = []
-
-        if "kubectl edit" in fix or "kubectl patch" in fix:
-            tools.append("execute_kubectl")
-        if "kubectl logs" in fix:
-            tools.append("get_pod_logs")
-        if "kubectl describe" in fix or "kubectl get" in fix:
-            tools.append("debug_resource")
-
-        # If no specific tools found, assume basic debugging is needed
-        if not tools:
-            tools = ["debug_resource", "get_pod_logs"]
-
-        return tools
+    def _match_scenario_query(self, name_lower: str, content: str) -> Tuple[str, str]:
+        """Return (scenario_type, query_template) for the first matching table entry."""
+        best = len(self._SCENARIO_QUERIES)
+        for match in self._SCENARIO_KEYWORD_RE.finditer(name_lower):
+            best = min(best, self._SCENARIO_KEYWORD_PRIORITY[match.group(1)])
+
+        # Content markers only matter for entries that outrank the name match
+        for index in self._CONTENT_MARKER_ENTRIES:
+            if index >= best:
+                break
+            if any(marker in content for marker in self._SCENARIO_QUERIES[index][2]):
+                best = index
+                break
+
+        if best == len(self._SCENARIO_QUERIES):
+            return self._DEFAULT_SCENARIO_QUERY
+        scenario_type, _, _, query_template = self._SCENARIO_QUERIES[best]
+        return scenario_type, query_template
 
     def load_scenarios(self) -> List[KubentlyScenario]:
         """Load all scenarios from the scenarios directory."""
-        scenarios = []
-
         if not self.scenarios_dir.exists():
             raise FileNotFoundError(f"Scenarios directory not found: {self.scenarios_dir}")
 
-        for scenario_file in sorted(self.scenarios_dir.glob("*.sh")):
-            scenario = self.parse_scenario_file(scenario_file)
-            if scenario:
-                scenarios.append(scenario)
-
-        return scenarios
+        # is_file() uses the type scandir already read; only .sh entries pay
+        # for the stat() that spots empty scripts, which have nothing to parse
+        scenario_files = []
+        with os.scandir(self.scenarios_dir) as entries:
+            for entry in entries:
+                if not (entry.name.endswith(".sh") and entry.is_file()):
+                    continue
+                if entry.stat().st_size == 0:
+                    print(f"Warning: skipping empty scenario script {entry.path}")
+                    continue
+                scenario_files.append(Path(entry.path))
+        scenario_files.sort()
+
+        # Scenario files are independent and mostly I/O to read, so parse them
+        # concurrently; map() keeps the sorted order.
+        max_workers = min(32, (os.cpu_count() or 1) * 4, len(scenario_files) or 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            parsed = executor.map(self.parse_scenario_file, scenario_files)
+            return [scenario for scenario in parsed if scenario]
 
     def create_dataset(self, dataset_name: str, description: Optional[str] = None) -> Dataset:
         """Create a LangSmith dataset."""
@@ -207,12 +303,12 @@ class DatasetBuilder:
 
         # Check if dataset already exists
         try:
-            datasets = list(self.client.list_datasets(dataset_name=dataset_name))
-            if datasets:
-                print(f"Dataset '{dataset_name}' already exists. Using existing dataset.")
-                return datasets[0]
-        except:
-            pass
+            existing = next(iter(self.client.list_datasets(dataset_name=dataset_name)), None)
+        except LangSmithError:
+            existing = None
+        if existing is not None:
+            print(f"Dataset '{dataset_name}' already exists. Using existing dataset.")
+            return existing
 
         # Create new dataset
         dataset = self.client.create_dataset(
@@ -225,10 +321,18 @@ class DatasetBuilder:
         return dataset
 
     def add_examples_to_dataset(self, dataset: Dataset, scenarios: List[KubentlyScenario]):
-        """Add scenarios as examples to the dataset."""
+        """Add scenarios as examples to the dataset.
+
+        Examples are uploaded through the bulk endpoint, at most
+        ``EXAMPLE_BATCH_SIZE`` per request.
+        """
+        created_at = datetime.now().isoformat()
+        inputs_list = []
+        outputs_list = []
+        metadata_list = []
         for scenario in scenarios:
             # Create input (what the agent receives)
-            inputs = {
+            inputs_list.append({
                 "query": scenario.query,
                 "namespace": scenario.namespace,
                 "cluster_type": "kind",
@@ -237,42 +341,94 @@ class DatasetBuilder:
                     "scenario_type": scenario.metadata["scenario_type"],
                     "difficulty": scenario.metadata["difficulty"]
                 }
-            }
+            })
 
             # Create expected output (what we expect the agent to produce)
-            outputs = {
+            outputs_list.append({
                 "expected_fix": scenario.expected_fix,
                 "required_tools": scenario.metadata["required_tools"],
                 "validation_checks": scenario.validation_checks,
-                "success_criteria": {
-                    "root_cause_identified": True,
-                    "fix_proposed": True,
-                    "tools_used_correctly": True
-                }
-            }
-
-            # Add example to dataset
-            self.client.create_example(
-                inputs=inputs,
-                outputs=outputs,
-                dataset_id=dataset.id,
-                metadata={
-                    "scenario_name": scenario.name,
-                    "created_at": datetime.now().isoformat(),
-                    **scenario.metadata
-                }
+                "success_criteria": self._SUCCESS_CRITERIA
+            })
+
+            metadata_list.append({
+                "scenario_name": scenario.name,
+                "created_at": created_at,
+                **scenario.metadata
+            })
+
+        # Add examples to dataset
+        if not hasattr(self.client, "create_examples"):
+            self._create_examples_concurrently(
+                dataset, scenarios, inputs_list, outputs_list, metadata_list
             )
-
-            print(f"  Added example: {scenario.name}")
-
-    def build_full_dataset(self, dataset_name: Optional[str] = None) -> Dataset:
-        """Build a complete dataset from all scenarios."""
+            return
+
+        def upload_batch(start: int) -> int:
+            end = start + self.EXAMPLE_BATCH_SIZE
+            self.client.create_examples(
+                inputs=inputs_list[start:end],
+                outputs=outputs_list[start:end],
+                metadata=metadata_list[start:end],
+                dataset_id=dataset.id
+            )
+            return start
+
+        # Batches are independent requests, so keep several in flight at once
+        batch_starts = range(0, len(scenarios), self.EXAMPLE_BATCH_SIZE)
+        max_workers = max(1, min(self.EXAMPLE_UPLOAD_WORKERS, len(batch_starts)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for start in executor.map(upload_batch, batch_starts):
+                for scenario in scenarios[start:start + self.EXAMPLE_BATCH_SIZE]:
+                    print(f"  Added example: {scenario.name}")
+
+    def _create_examples_concurrently(
+        self,
+        dataset: Dataset,
+        scenarios: List[KubentlyScenario],
+        inputs_list: List[Dict[str, Any]],
+        outputs_list: List[Dict[str, Any]],
+        metadata_list: List[Dict[str, Any]]
+    ):
+        """Upload examples one request each, overlapping the round trips.
+
+        Fallback for LangSmith clients without the bulk endpoint; the pool size
+        caps the number of in-flight requests.
+        """
+        with ThreadPoolExecutor(max_workers=self.EXAMPLE_UPLOAD_WORKERS) as executor:
+            futures = {
+                executor.submit(
+                    self.client.create_example,
+                    inputs=inputs,
+                    outputs=outputs,
+                    dataset_id=dataset.id,
+                    metadata=metadata
+                ): scenario
+                for scenario, inputs, outputs, metadata in zip(
+                    scenarios, inputs_list, outputs_list, metadata_list
+                )
+            }
+            for future in as_completed(futures):
+                future.result()
+                print(f"  Added example: {futures[future].name}")
+
+    def build_full_dataset(
+        self,
+        dataset_name: Optional[str] = None,
+        scenarios: Optional[List[KubentlyScenario]] = None
+    ) -> Dataset:
+        """Build a complete dataset from all scenarios.
+
+        Pass ``scenarios`` to reuse an already loaded list instead of parsing
+        the scenarios directory again.
+        """
         if not dataset_name:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             dataset_name = f"kubently-scenarios-{timestamp}"
 
-        print("Loading scenarios...")
-        scenarios = self.load_scenarios()
+        if scenarios is None:
+            print("Loading scenarios...")
+            scenarios = self.load_scenarios()
         print(f"Found {len(scenarios)} scenarios")
 
         print(f"\nCreating dataset: {dataset_name}")
@@ -286,42 +442,53 @@ class DatasetBuilder:
 
         return dataset
 
-    def export_to_json(self, output_file: Optional[Path] = None) -> Path:
-        """Export scenarios to JSON format for offline use."""
+    def export_to_json(
+        self,
+        output_file: Optional[Path] = None,
+        scenarios: Optional[List[KubentlyScenario]] = None
+    ) -> Path:
+        """Export scenarios to JSON format for offline use.
+
+        Pass ``scenarios`` to reuse an already loaded list instead of parsing
+        the scenarios directory again.
+        """
         if not output_file:
             output_file = Path("kubently_dataset.json")
 
-        scenarios = self.load_scenarios()
+        if scenarios is None:
+            scenarios = self.load_scenarios()
 
-        dataset = {
+        header = {
             "name": "kubently-scenarios",
             "description": "Kubently test scenarios for debugging Kubernetes issues",
-            "created_at": datetime.now().isoformat(),
-            "examples": []
+            "created_at": datetime.now().isoformat()
         }
 
-        for scenario in scenarios:
-            example = {
-                "inputs": {
-                    "query": scenario.query,
-                    "namespace": scenario.namespace,
-                    "cluster_type": "kind",
-                    "metadata": scenario.metadata
-                },
-                "outputs": {
-                    "expected_fix": scenario.expected_fix,
-                    "required_tools": scenario.metadata["required_tools"],
-                    "validation_checks": scenario.validation_checks
-                },
-                "metadata": {
-                    "scenario_name": scenario.name,
-                    **scenario.metadata
+        # Stream one compact example per line instead of building and
+        # pretty-printing the whole document in memory
+        with open(output_file, "wb") as f:
+            f.write(orjson.dumps(header)[:-1] + b',"examples":[')
+            for index, scenario in enumerate(scenarios):
+                example = {
+                    "inputs": {
+                        "query": scenario.query,
+                        "namespace": scenario.namespace,
+                        "cluster_type": "kind",
+                        "metadata": scenario.metadata
+                    },
+                    "outputs": {
+                        "expected_fix": scenario.expected_fix,
+                        "required_tools": scenario.metadata["required_tools"],
+                        "validation_checks": scenario.validation_checks
+                    },
+                    "metadata": {
+                        "scenario_name": scenario.name,
+                        **scenario.metadata
+                    }
                 }
-            }
-            dataset["examples"].append(example)
-
-        with open(output_file, "w") as f:
-            json.dump(dataset, f, indent=2)
+                f.write(b",\n  " if index else b"\n  ")
+                f.write(orjson.dumps(example))
+            f.write(b"\n]}\n")
 
         print(f"Exported dataset to {output_file}")
         return output_file
@@ -344,11 +511,14 @@ def main():
         output_file = Path(args.json_file) if args.json_file else None
         builder.export_to_json(output_file)
     else:
-        dataset = builder.build_full_dataset(args.dataset_name)
+        # Parse the scenarios once and share them with the JSON backup
+        print("Loading scenarios...")
+        scenarios = builder.load_scenarios()
+        dataset = builder.build_full_dataset(args.dataset_name, scenarios=scenarios)
 
         # Also export to JSON for backup
         json_file = Path(f"kubently_dataset_{dataset.id}.json")
-        builder.export_to_json(json_file)
+        builder.export_to_json(json_file, scenarios=scenarios)
 
 
 if __name__ == "__main__":
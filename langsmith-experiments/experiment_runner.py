@@ -5,27 +5,58 @@ Tests different prompts, tools, and configurations using LangSmith experiments
 """
 
 import asyncio
+import contextlib
+import hashlib
 import json
 import os
+import re
+import tempfile
 import time
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Mapping, Optional, Any, Callable
 from dataclasses import dataclass, asdict
 from enum import Enum
+from functools import lru_cache
 
 from langsmith import Client, RunTree
-from langsmith.evaluation import evaluate, EvaluationResult
+from langsmith.evaluation import aevaluate, EvaluationResult
 from langsmith.schemas import Run, Example
+from langsmith.utils import LangSmithNotFoundError
 from langchain_core.prompts import PromptTemplate
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_anthropic import ChatAnthropic
 from langchain_openai import ChatOpenAI
 import httpx
+import orjson
 
 
-@dataclass
+_KUBECTL_CMD_RE = re.compile(r'kubectl\s+\w+\s+\w+')
+_TOOL_CALL_RE = re.compile(r'🔧 Tool Call: (\w+)')
+
+# (words in the expected fix, key terms the response should then mention)
+_ROOT_CAUSE_TERMS = (
+    (("image",), ("image", "pull", "registry")),
+    (("crash",), ("crash", "exit", "error")),
+    (("service",), ("service", "selector", "port")),
+    (("rbac", "permission"), ("rbac", "permission", "role", "authorization")),
+    (("configmap",), ("configmap", "configuration", "missing")),
+    (("secret",), ("secret", "credentials", "missing")),
+    (("resource", "oom"), ("memory", "resource", "limit", "oom")),
+)
+
+_TECH_TERMS = frozenset({"pod", "container", "namespace", "kubectl", "kubernetes", "service"})
+_FIX_KEYWORDS = ("fix", "solution", "resolve", "patch", "update", "change", "modify")
+
+
+@lru_cache(maxsize=128)
+def _prompt_template(template: str) -> PromptTemplate:
+    """Parse a prompt template once; configs commonly share the same template."""
+    return PromptTemplate.from_template(template)
+
+
+@dataclass(slots=True, frozen=True)
 class ExperimentConfig:
     """Configuration for an experiment run."""
     prompt_template: str
@@ -33,9 +64,63 @@ class ExperimentConfig:
     model_provider: str  # "gemini", "anthropic", "openai"
     temperature: float = 0.7
     max_tokens: int = 4096
-    tool_config: Dict[str, Any] = None
+    tool_config: Optional[Mapping[str, Any]] = None
     system_prompt: Optional[str] = None
-    metadata: Dict[str, Any] = None
+    metadata: Optional[Mapping[str, Any]] = None
+
+
+class ResponseCache:
+    """On-disk cache of agent responses, one JSON file per request."""
+
+    def __init__(self, cache_dir: Path = Path(".kubently_cache")):
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def make_key(config: ExperimentConfig, inputs: Dict[str, Any], api_url: str) -> str:
+        """Hash the config fields that shape a response together with the inputs.
+
+        ``api_url`` is part of the key: the Kubently deployment answering the
+        request matters more to the response than any config field.
+        """
+        payload = json.dumps(
+            {
+                "api_url": api_url,
+                "model_provider": config.model_provider,
+                "model_name": config.model_name,
+                "temperature": config.temperature,
+                "max_tokens": config.max_tokens,
+                "system_prompt": config.system_prompt,
+                "prompt_template": config.prompt_template,
+                "inputs": inputs,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for a key, or None on a miss."""
+        try:
+            return json.loads((self.cache_dir / f"{key}.json").read_bytes())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def set(self, key: str, value: Dict[str, Any]):
+        """Store an entry, replacing the file atomically.
+
+        Each write goes through its own temporary file, so concurrent writers
+        of the same key never rename each other's file away.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", dir=self.cache_dir, suffix=".tmp", delete=False
+        ) as tmp:
+            tmp.write(json.dumps(value))
+        try:
+            os.replace(tmp.name, self.cache_dir / f"{key}.json")
+        except OSError:
+            os.unlink(tmp.name)
+            raise
 
 
 class KubentlyEvaluator:
@@ -50,7 +135,15 @@ class KubentlyEvaluator:
         run: Run,
         example: Example
     ) -> EvaluationResult:
-        """Evaluate a single response against expected outputs."""
+        """Evaluate a single response against expected outputs.
+
+        Scoring is CPU-only, so it runs in a worker thread to keep the event
+        loop free for the A2A streams of other examples.
+        """
+        return await asyncio.to_thread(self._score_sync, run, example)
+
+    def _score_sync(self, run: Run, example: Example) -> EvaluationResult:
+        """Score a response against expected outputs."""
         scores = {}
         feedback = []
 
@@ -59,8 +152,12 @@ class KubentlyEvaluator:
         expected_fix = example.outputs.get("expected_fix", "")
         required_tools = example.outputs.get("required_tools", [])
 
+        # Lowercase once; every text scorer matches case-insensitively
+        response_lower = response.lower()
+        expected_lower = expected_fix.lower()
+
         # Score: Root cause identification
-        root_cause_score = self._score_root_cause_identification(response, expected_fix)
+        root_cause_score = self._score_root_cause_identification(response_lower, expected_lower)
         scores["root_cause_identification"] = root_cause_score
         if root_cause_score < 0.8:
             feedback.append(f"Root cause not clearly identified. Expected: {expected_fix[:100]}...")
@@ -75,13 +172,13 @@ class KubentlyEvaluator:
                 feedback.append(f"Missing required tools: {', '.join(missing_tools)}")
 
         # Score: Fix accuracy
-        fix_score = self._score_fix_accuracy(response, expected_fix)
+        fix_score = self._score_fix_accuracy(response_lower, expected_lower)
         scores["fix_accuracy"] = fix_score
         if fix_score < 0.8:
             feedback.append("Proposed fix doesn't match expected solution")
 
         # Score: Response quality
-        quality_score = self._score_response_quality(response)
+        quality_score = self._score_response_quality(response, response_lower)
         scores["response_quality"] = quality_score
         if quality_score < 0.7:
             feedback.append("Response lacks clarity or completeness")
@@ -105,35 +202,25 @@ class KubentlyEvaluator:
             comment="; ".join(feedback) if feedback else "All checks passed"
         )
 
-    def _score_root_cause_identification(self, response: str, expected_fix: str) -> float:
-        """Score how well the root cause was identified."""
-        response_lower = response.lower()
-        expected_lower = expected_fix.lower()
-
+    def _score_root_cause_identification(self, response_lower: str, expected_lower: str) -> float:
+        """Score how well the root cause was identified, given lowercased texts."""
         # Extract key terms from expected fix
-        key_terms = []
-        if "image" in expected_lower:
-            key_terms.extend(["image", "pull", "registry"])
-        if "crash" in expected_lower:
-            key_terms.extend(["crash", "exit", "error"])
-        if "service" in expected_lower:
-            key_terms.extend(["service", "selector", "port"])
-        if "rbac" in expected_lower or "permission" in expected_lower:
-            key_terms.extend(["rbac", "permission", "role", "authorization"])
-        if "configmap" in expected_lower:
-            key_terms.extend(["configmap", "configuration", "missing"])
-        if "secret" in expected_lower:
-            key_terms.extend(["secret", "credentials", "missing"])
-        if "resource" in expected_lower or "oom" in expected_lower:
-            key_terms.extend(["memory", "resource", "limit", "oom"])
+        key_terms = [
+            term
+            for triggers, terms in _ROOT_CAUSE_TERMS
+            if any(trigger in expected_lower for trigger in triggers)
+            for term in terms
+        ]
 
         # Count matching key terms
         matches = sum(1 for term in key_terms if term in response_lower)
         if key_terms:
             return min(1.0, matches / len(key_terms))
         else:
-            # If no specific key terms, do a simple substring check
-            return 1.0 if any(word in response_lower for word in expected_lower.split()[:3]) else 0.5
+            # If no specific key terms, do a simple substring check on the first
+            # three words; maxsplit keeps long expected fixes from being split whole
+            first_words = expected_lower.split(maxsplit=3)[:3]
+            return 1.0 if any(word in response_lower for word in first_words) else 0.5
 
     def _score_tool_usage(self, tools_used: List[str], required_tools: List[str]) -> float:
         """Score how well the required tools were used."""
@@ -150,29 +237,23 @@ class KubentlyEvaluator:
 
         return len(intersection) / len(required_set)
 
-    def _score_fix_accuracy(self, response: str, expected_fix: str) -> float:
-        """Score the accuracy of the proposed fix."""
-        response_lower = response.lower()
-        expected_lower = expected_fix.lower()
-
+    def _score_fix_accuracy(self, response_lower: str, expected_lower: str) -> float:
+        """Score the accuracy of the proposed fix, given lowercased texts."""
         # Look for kubectl commands
         if "kubectl" in expected_lower:
             # Extract kubectl commands from expected
-            import re
-            expected_cmds = re.findall(r'kubectl\s+\w+\s+\w+', expected_lower)
-            response_cmds = re.findall(r'kubectl\s+\w+\s+\w+', response_lower)
+            expected_cmds = _KUBECTL_CMD_RE.findall(expected_lower)
 
             if expected_cmds:
                 matching = sum(1 for cmd in expected_cmds if cmd in response_lower)
                 return min(1.0, matching / len(expected_cmds))
 
         # Fallback to keyword matching
-        fix_keywords = ["fix", "solution", "resolve", "patch", "update", "change", "modify"]
-        has_fix = any(keyword in response_lower for keyword in fix_keywords)
+        has_fix = any(keyword in response_lower for keyword in _FIX_KEYWORDS)
 
         return 0.8 if has_fix else 0.4
 
-    def _score_response_quality(self, response: str) -> float:
+    def _score_response_quality(self, response: str, response_lower: str) -> float:
         """Score the overall quality of the response."""
         score = 1.0
 
@@ -187,8 +268,7 @@ class KubentlyEvaluator:
             score += 0.1  # Has paragraphs/structure
 
         # Check for technical content
-        tech_terms = ["pod", "container", "namespace", "kubectl", "kubernetes", "service"]
-        tech_count = sum(1 for term in tech_terms if term in response.lower())
+        tech_count = sum(1 for term in _TECH_TERMS if term in response_lower)
         if tech_count < 2:
             score -= 0.2
 
@@ -202,10 +282,14 @@ class ExperimentRunner:
         self,
         api_url: str = "http://localhost:8080",
         api_key: str = "test-api-key",
-        langsmith_api_key: Optional[str] = None
+        langsmith_api_key: Optional[str] = None,
+        use_cache: bool = True,
+        max_concurrency: int = 5
     ):
         self.api_url = api_url
         self.api_key = api_key
+        self.use_cache = use_cache
+        self.response_cache = ResponseCache()
         self.langsmith_api_key = langsmith_api_key or os.getenv("LANGSMITH_API_KEY")
 
         if not self.langsmith_api_key:
@@ -214,17 +298,40 @@ class ExperimentRunner:
         self.client = Client(api_key=self.langsmith_api_key)
         self.evaluator = KubentlyEvaluator(api_url, api_key)
 
-        # A2A client for actual API calls
+        # Chat models by (provider, model, temperature, max_tokens)
+        self._model_cache: Dict[tuple, Any] = {}
+
+        # A2A client for actual API calls, shared by every config. The pool
+        # covers max_concurrency streams; HTTP/2 lets them share connections
+        # when the API is served over TLS.
         self.http_client = httpx.AsyncClient(
             base_url=f"{api_url}/a2a/",
             headers={
                 "X-API-Key": api_key,
                 "Content-Type": "application/json",
             },
-            timeout=120.0,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency,
+                keepalive_expiry=60.0,
+            ),
+            timeout=httpx.Timeout(connect=10.0, read=120.0, write=30.0, pool=30.0),
         )
 
     def create_model(self, config: ExperimentConfig):
+        """Return the language model for a configuration, reusing earlier instances.
+
+        Building a chat model sets up its own HTTP client and auth, so one is
+        shared by every configuration with the same model settings.
+        """
+        key = (config.model_provider, config.model_name, config.temperature, config.max_tokens)
+        model = self._model_cache.get(key)
+        if model is None:
+            model = self._model_cache[key] = self._build_model(config)
+        return model
+
+    def _build_model(self, config: ExperimentConfig):
         """Create a language model based on configuration."""
         if config.model_provider == "gemini":
             return ChatGoogleGenerativeAI(
@@ -251,19 +358,44 @@ class ExperimentRunner:
         self,
         config: ExperimentConfig,
         inputs: Dict[str, Any],
-        run_tree: Optional[RunTree] = None
+        run_tree: Optional[RunTree] = None,
+        config_dict: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
-        """Run a single test with the given configuration."""
+        """Run a single test with the given configuration.
+
+        ``config_dict`` is the config as reported in the result; pass it in
+        to avoid converting the config again for every example.
+        """
+        if config_dict is None:
+            config_dict = asdict(config) if hasattr(config, '__dataclass_fields__') else config
+
         # Build the prompt
-        prompt = PromptTemplate.from_template(config.prompt_template)
+        prompt = _prompt_template(config.prompt_template)
         formatted_prompt = prompt.format(**inputs)
 
         if config.system_prompt:
             formatted_prompt = f"{config.system_prompt}\n\n{formatted_prompt}"
 
+        # Replay recorded responses, sampled ones included: the cache is for
+        # re-running an experiment to iterate on the evaluator, where a fresh
+        # sample would only add noise. --no-cache calls the agent every time.
+        cache_key = None
+        if self.use_cache:
+            cache_key = ResponseCache.make_key(config, inputs, self.api_url)
+            cached = await asyncio.to_thread(self.response_cache.get, cache_key)
+            if cached is not None:
+                return {
+                    "response": cached["response"],
+                    "tools_used": cached["tools_used"],
+                    "prompt_used": formatted_prompt,
+                    "config": config_dict,
+                    "timestamp": datetime.now().isoformat()
+                }
+
         # Make the actual API call to Kubently
         response_text = ""
         tools_used = []
+        call_failed = False
 
         try:
             # Send to actual Kubently API via A2A protocol
@@ -283,9 +415,11 @@ class ExperimentRunner:
             async with self.http_client.stream("POST", "/", json=request) as response:
                 if response.status_code == 200:
                     async for line in response.aiter_lines():
-                        if line.startswith("data: "):
+                        # Only artifact and status updates carry anything we keep,
+                        # so skip heartbeats and other events without parsing them
+                        if line.startswith("data: ") and ("artifact-update" in line or "status-update" in line):
                             try:
-                                data = json.loads(line[6:])
+                                data = orjson.loads(line[6:])
                                 result = data.get("result", {})
 
                                 # Extract response text
@@ -294,6 +428,10 @@ class ExperimentRunner:
                                     for part in artifact.get("parts", []):
                                         if part.get("kind") == "text":
                                             response_text = part.get("text", "")
+                                    # The agent sends its answer as one last chunk
+                                    # just before completing, so stop reading here
+                                    if result.get("lastChunk"):
+                                        break
 
                                 # Extract tool calls
                                 if result.get("kind") == "status-update":
@@ -303,32 +441,58 @@ class ExperimentRunner:
                                             if part.get("kind") == "text":
                                                 text = part.get("text", "")
                                                 if "🔧 Tool Call:" in text:
-                                                    import re
-                                                    tool_match = re.search(r'🔧 Tool Call: (\w+)', text)
+                                                    tool_match = _TOOL_CALL_RE.search(text)
                                                     if tool_match:
                                                         tools_used.append(tool_match.group(1))
+                                    if result.get("final"):
+                                        break
 
-                            except json.JSONDecodeError:
+                            except orjson.JSONDecodeError:
                                 pass
+                else:
+                    call_failed = True
 
         except Exception as e:
             response_text = f"Error calling API: {str(e)}"
+            call_failed = True
+
+        if cache_key is not None and not call_failed:
+            # A failed cache write only costs a later cache miss
+            with contextlib.suppress(OSError):
+                await asyncio.to_thread(
+                    self.response_cache.set,
+                    cache_key,
+                    {"response": response_text, "tools_used": tools_used}
+                )
 
         # Return results
         return {
             "response": response_text,
             "tools_used": tools_used,
             "prompt_used": formatted_prompt,
-            "config": asdict(config) if hasattr(config, '__dataclass_fields__') else config,
+            "config": config_dict,
             "timestamp": datetime.now().isoformat()
         }
 
-    def create_test_function(self, config: ExperimentConfig) -> Callable:
-        """Create a test function for LangSmith evaluation."""
+    def create_test_function(
+        self,
+        config: ExperimentConfig,
+        config_dict: Optional[Dict[str, Any]] = None,
+        request_slots: Optional[asyncio.Semaphore] = None
+    ) -> Callable:
+        """Create a test function for LangSmith evaluation.
+
+        If ``request_slots`` is given, each call holds one of its slots, so
+        test functions sharing it are bounded together.
+        """
+        if config_dict is None:
+            config_dict = asdict(config) if hasattr(config, '__dataclass_fields__') else config
+        slots = request_slots if request_slots is not None else contextlib.nullcontext()
 
         async def test_fn(inputs: Dict[str, Any]) -> Dict[str, Any]:
             """Test function that will be called by LangSmith."""
-            return await self.run_single_test(config, inputs)
+            async with slots:
+                return await self.run_single_test(config, inputs, config_dict=config_dict)
 
         return test_fn
 
@@ -337,52 +501,79 @@ class ExperimentRunner:
         dataset_name: str,
         configs: List[ExperimentConfig],
         experiment_prefix: str = "kubently-experiment",
-        max_concurrency: int = 5
+        max_concurrency: int = 5,
+        outer_concurrency: int = 3,
+        output_file: Optional[Path] = None
     ) -> List[Dict[str, Any]]:
-        """Run an experiment with multiple configurations."""
-        results = []
-
+        """Run an experiment with multiple configurations.
+
+        Configurations are independent, so up to ``outer_concurrency`` of them
+        run at once. ``max_concurrency`` bounds the tests in flight across all
+        of them, so running configs side by side does not raise the request
+        rate against Kubently. Results keep the order of ``configs``. If ``output_file`` is given, each result is appended
+        to it as a JSON line as soon as its configuration finishes.
+        """
         # Get the dataset
-        datasets = list(self.client.list_datasets(dataset_name=dataset_name))
-        if not datasets:
-            raise ValueError(f"Dataset '{dataset_name}' not found")
-        dataset = datasets[0]
+        try:
+            dataset = self.client.read_dataset(dataset_name=dataset_name)
+        except LangSmithNotFoundError:
+            raise ValueError(f"Dataset '{dataset_name}' not found") from None
+
+        # Fetch the examples once and hand every config the same list, rather
+        # than having aevaluate() download the dataset again for each config
+        examples = list(self.client.list_examples(dataset_id=dataset.id))
 
         print(f"Running experiment on dataset: {dataset_name}")
         print(f"Testing {len(configs)} configurations")
 
-        for i, config in enumerate(configs, 1):
-            experiment_name = f"{experiment_prefix}-{i}-{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            print(f"\n[{i}/{len(configs)}] Running configuration: {config.model_name}")
-
-            # Create test function for this config
-            test_fn = self.create_test_function(config)
-
-            # Run evaluation
-            eval_results = await evaluate(
-                test_fn,
-                data=dataset_name,
-                evaluators=[self.evaluator.evaluate_response],
-                experiment=experiment_name,
-                max_concurrency=max_concurrency,
-                metadata={
-                    "config": asdict(config) if hasattr(config, '__dataclass_fields__') else config,
+        semaphore = asyncio.Semaphore(max(1, outer_concurrency))
+        request_slots = asyncio.Semaphore(max(1, max_concurrency))
+
+        with open(output_file, "wb") if output_file else contextlib.nullcontext() as out:
+
+            async def run_one(i: int, config: ExperimentConfig) -> Dict[str, Any]:
+                async with semaphore:
+                    experiment_name = f"{experiment_prefix}-{i}-{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+                    print(f"\n[{i}/{len(configs)}] Running configuration: {config.model_name}")
+
+                    # Convert the config once for the metadata and every example's result
+                    config_dict = asdict(config) if hasattr(config, '__dataclass_fields__') else config
+
+                    # Create test function for this config
+                    test_fn = self.create_test_function(config, config_dict, request_slots)
+
+                    # Run evaluation; request_slots enforces the shared bound,
+                    # so each config may use all of it when the others are idle
+                    eval_results = await aevaluate(
+                        test_fn,
+                        data=examples,
+                        evaluators=[self.evaluator.evaluate_response],
+                        experiment=experiment_name,
+                        max_concurrency=max_concurrency,
+                        metadata={
+                            "config": config_dict,
+                            "timestamp": datetime.now().isoformat()
+                        }
+                    )
+
+                print(f"  [{i}/{len(configs)}] Completed. View at: https://smith.langchain.com/experiments/{experiment_name}")
+
+                result_summary = {
+                    "experiment_name": experiment_name,
+                    "config": config,
+                    "results": eval_results,
                     "timestamp": datetime.now().isoformat()
                 }
-            )
-
-            # Collect results
-            result_summary = {
-                "experiment_name": experiment_name,
-                "config": config,
-                "results": eval_results,
-                "timestamp": datetime.now().isoformat()
-            }
-            results.append(result_summary)
+                if out is not None:
+                    out.write(orjson.dumps(
+                        result_summary,
+                        default=str,
+                        option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+                    ))
+                    out.flush()
+                return result_summary
 
-            print(f"  Completed. View at: https://smith.langchain.com/experiments/{experiment_name}")
-
-        return results
+            return list(await asyncio.gather(*(run_one(i, config) for i, config in enumerate(configs, 1))))
 
     async def close(self):
         """Close HTTP client."""
@@ -520,11 +711,18 @@ async def main():
     parser.add_argument("--api-key", default="test-api-key", help="API key")
     parser.add_argument("--experiment-prefix", default="kubently-exp", help="Experiment name prefix")
     parser.add_argument("--max-concurrency", type=int, default=5, help="Max concurrent evaluations")
+    parser.add_argument("--outer-concurrency", type=int, default=3, help="Max configurations evaluated at once")
     parser.add_argument("--configs", help="Path to JSON file with configurations")
+    parser.add_argument("--no-cache", action="store_true", help="Always call the API instead of reusing cached responses")
 
     args = parser.parse_args()
 
-    runner = ExperimentRunner(args.api_url, args.api_key)
+    runner = ExperimentRunner(
+        args.api_url,
+        args.api_key,
+        use_cache=not args.no_cache,
+        max_concurrency=args.max_concurrency
+    )
 
     try:
         # Load or create configurations
@@ -535,19 +733,17 @@ async def main():
         else:
             configs = create_default_configs()
 
-        # Run experiments
-        results = await runner.run_experiment(
+        # Run experiments, streaming each result summary to disk as it completes
+        output_file = Path(f"experiment_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl")
+        await runner.run_experiment(
             dataset_name=args.dataset,
             configs=configs,
             experiment_prefix=args.experiment_prefix,
-            max_concurrency=args.max_concurrency
+            max_concurrency=args.max_concurrency,
+            outer_concurrency=args.outer_concurrency,
+            output_file=output_file
         )
 
-        # Save results summary
-        output_file = f"experiment_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(output_file, "w") as f:
-            json.dump(results, f, indent=2, default=str)
-
         print(f"\nExperiment complete. Results saved to: {output_file}")
 
     finally:
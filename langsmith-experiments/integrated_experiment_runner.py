@@ -5,56 +5,167 @@ Manages scenario setup/teardown and runs experiments with real Kubernetes issues
 """
 
 import asyncio
-import json
+import contextlib
 import os
+import re
 import subprocess
+import threading
 import time
 import uuid
 from datetime import datetime
+from collections import defaultdict
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, asdict
-from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict, field
+from functools import lru_cache
 import logging
 
 from langsmith import Client, RunTree
 from langsmith.evaluation import evaluate, EvaluationResult
 from langsmith.schemas import Run, Example
-from langchain_core.prompts import PromptTemplate
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_anthropic import ChatAnthropic
 from langchain_openai import ChatOpenAI
 import httpx
+import orjson
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Scripts are scanned as raw bytes; namespace names are ASCII
+_NAMESPACE_VAR_RE = re.compile(rb'NAMESPACE="?([^"\s]+)"?')
+_CREATE_NAMESPACE_RE = re.compile(rb'create\s+namespace\s+([^\s]+)')
+_SCENARIO_NUMBER_RE = re.compile(r'(\d+)-')
+_TOOL_CALL_RE = re.compile(r'🔧 Tool Call: (\w+)')
+
+# Seconds to wait for kubectl proxy to report its address before falling back
+_KUBE_PROXY_START_TIMEOUT = 10.0
+
+# Longest response kept per scenario; longer answers are truncated with a marker
+MAX_RESPONSE_CHARS = 64_000
+
+
+async def _aiter_sse_data(response: httpx.Response):
+    """Yield the payload of each ``data:`` line of a server-sent event stream.
+
+    Lines are split on the raw bytes, so payloads reach orjson without
+    being decoded to str first. Trailing ``\\r`` of CRLF lines is left on
+    the payload; it is JSON whitespace. test-automation/a2a_test_client.py
+    carries a copy as ``_iter_sse_data``; change both together.
+    """
+    buffer = bytearray()
+    async for chunk in response.aiter_bytes():
+        buffer += chunk
+        start = 0
+        while (end := buffer.find(b"\n", start)) != -1:
+            if buffer.startswith(b"data: ", start, end):
+                yield bytes(buffer[start + 6:end])
+            start = end + 1
+        del buffer[:start]
+
+    if buffer.startswith(b"data: "):
+        yield bytes(buffer[6:])
+
+
+@lru_cache(maxsize=1024)
+def _expected_key_terms(expected_fix: str) -> Tuple[str, ...]:
+    """Return the first five lowercased words of an expected fix.
+
+    Expected fixes are fixed per example, so the split is cached and shared
+    by every evaluation of the same example.
+    """
+    return tuple(expected_fix.lower().split(maxsplit=5)[:5])
+
+
+@dataclass
+class _StreamState:
+    """What a scenario test collects from the A2A event stream."""
+    response_text: str = ""
+    tools_used: List[str] = field(default_factory=list)
+
+
+def _handle_artifact_update(result: Dict[str, Any], state: _StreamState):
+    """Extract response text from an artifact-update event."""
+    artifact = result.get("artifact", {})
+    for part in artifact.get("parts", []):
+        if part.get("kind") == "text":
+            text = part.get("text", "")
+            if len(text) > MAX_RESPONSE_CHARS:
+                text = text[:MAX_RESPONSE_CHARS] + "…[truncated]"
+            state.response_text = text
+
+
+def _handle_status_update(result: Dict[str, Any], state: _StreamState):
+    """Extract tool calls from a status-update event."""
+    message = result.get("status", {}).get("message", {})
+    if not message or "parts" not in message:
+        return
+
+    for part in message["parts"]:
+        if part.get("kind") != "text":
+            continue
+        text = part.get("text", "")
+        # Most status messages are not tool calls; skip the regex for them
+        if "🔧 Tool Call:" in text:
+            tool_match = _TOOL_CALL_RE.search(text)
+            if tool_match:
+                state.tools_used.append(tool_match.group(1))
+
+
+_EVENT_HANDLERS = {
+    "artifact-update": _handle_artifact_update,
+    "status-update": _handle_status_update,
+}
+
+
+async def _run_command(args: List[str], timeout: float) -> Tuple[int, str]:
+    """Run a command without blocking the event loop.
+
+    Returns the exit code and stderr; the process is killed on timeout.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *args,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        _, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise TimeoutError(f"{' '.join(args)} timed out after {timeout}s") from None
+    return proc.returncode, stderr.decode(errors="replace")
+
 
 @dataclass
 class ScenarioSetup:
-    """Manages setup and teardown of test scenarios."""
+    """Manages setup and teardown of test scenarios.
+
+    Each operation runs the scenario script in its own bash process. The
+    scripts end with ``exit`` and report usage via ``$0``, so they cannot be
+    sourced into a shared shell, and concurrent scenarios need independent
+    shells anyway; bash startup is a few ms against seconds of setup.
+    """
     name: str
     script_path: Path
     namespace: str
 
-    def setup(self) -> bool:
+    async def setup(self) -> bool:
         """Set up the scenario in Kubernetes."""
         try:
             logger.info(f"Setting up scenario: {self.name}")
-            result = subprocess.run(
+            returncode, stderr = await _run_command(
                 ["bash", str(self.script_path), "setup"],
-                capture_output=True,
-                text=True,
                 timeout=60
             )
 
-            if result.returncode != 0:
-                logger.error(f"Setup failed for {self.name}: {result.stderr}")
+            if returncode != 0:
+                logger.error(f"Setup failed for {self.name}: {stderr}")
                 return False
 
-            # Wait for resources to stabilize
-            time.sleep(3)
+            # The scripts wait for their resources before exiting, so the
+            # scenario is ready as soon as setup returns
             logger.info(f"Scenario {self.name} setup complete")
             return True
 
@@ -62,19 +173,17 @@ class ScenarioSetup:
             logger.error(f"Setup exception for {self.name}: {e}")
             return False
 
-    def cleanup(self) -> bool:
+    async def cleanup(self) -> bool:
         """Clean up the scenario from Kubernetes."""
         try:
             logger.info(f"Cleaning up scenario: {self.name}")
-            result = subprocess.run(
+            returncode, stderr = await _run_command(
                 ["bash", str(self.script_path), "cleanup"],
-                capture_output=True,
-                text=True,
                 timeout=60
             )
 
-            if result.returncode != 0:
-                logger.error(f"Cleanup failed for {self.name}: {result.stderr}")
+            if returncode != 0:
+                logger.error(f"Cleanup failed for {self.name}: {stderr}")
                 return False
 
             logger.info(f"Scenario {self.name} cleanup complete")
@@ -84,30 +193,41 @@ class ScenarioSetup:
             logger.error(f"Cleanup exception for {self.name}: {e}")
             return False
 
-    def verify_setup(self) -> bool:
-        """Verify the scenario is properly set up."""
+    async def verify_setup(self, http: Optional[httpx.AsyncClient] = None) -> bool:
+        """Verify the scenario is properly set up.
+
+        ``http`` is a Kubernetes API client bound to ``kubectl proxy``; with
+        it the checks are two requests on a pooled connection, without it
+        they run through kubectl.
+        """
         try:
             # Check if namespace exists
-            result = subprocess.run(
-                ["kubectl", "get", "namespace", self.namespace],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+            if http is not None:
+                response = await http.get(f"/api/v1/namespaces/{self.namespace}")
+                namespace_found = response.status_code == 200
+            else:
+                returncode, _ = await _run_command(
+                    ["kubectl", "get", "namespace", self.namespace],
+                    timeout=10
+                )
+                namespace_found = returncode == 0
 
-            if result.returncode != 0:
+            if not namespace_found:
                 logger.error(f"Namespace {self.namespace} not found")
                 return False
 
             # Check for pods in namespace
-            result = subprocess.run(
-                ["kubectl", "get", "pods", "-n", self.namespace],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+            if http is not None:
+                response = await http.get(f"/api/v1/namespaces/{self.namespace}/pods")
+                pods_listed = response.status_code == 200
+            else:
+                returncode, _ = await _run_command(
+                    ["kubectl", "get", "pods", "-n", self.namespace],
+                    timeout=10
+                )
+                pods_listed = returncode == 0
 
-            if result.returncode != 0:
+            if not pods_listed:
                 logger.error(f"Failed to get pods in namespace {self.namespace}")
                 return False
 
@@ -160,24 +280,94 @@ class IntegratedExperimentRunner:
         if not self.scenarios_dir.exists():
             raise ValueError(f"Scenarios directory not found: {self.scenarios_dir}")
 
-        # HTTP client for Kubently API
+        # HTTP client for Kubently API, shared by every concurrent scenario;
+        # HTTP/2 lets their streams share connections when served over TLS
         self.http_client = httpx.AsyncClient(
             base_url=f"{api_url}/a2a/",
             headers={
                 "X-API-Key": api_key,
                 "Content-Type": "application/json",
             },
-            timeout=120.0,
+            http2=True,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            timeout=httpx.Timeout(120.0, connect=5.0),
         )
 
-        # Thread pool for parallel scenario setup
-        self.executor = ThreadPoolExecutor(max_workers=4)
+        # Kubernetes API access for scenario verification, via one kubectl proxy
+        self._kube_proxy: Optional[subprocess.Popen] = None
+        self.kube_client: Optional[httpx.AsyncClient] = None
+        self._start_kube_proxy()
+
+    def _start_kube_proxy(self):
+        """Start ``kubectl proxy`` on a free port and bind kube_client to it.
+
+        If the proxy cannot start, kube_client stays None and scenarios are
+        verified with kubectl instead.
+        """
+        try:
+            self._kube_proxy = subprocess.Popen(
+                ["kubectl", "proxy", "--port=0"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True
+            )
+        except OSError as e:
+            logger.warning(f"Could not start kubectl proxy: {e}")
+            return
+
+        # kubectl prints "Starting to serve on 127.0.0.1:<port>" once listening.
+        # Read it on a helper thread so a proxy that stalls (e.g. on an exec
+        # credential prompt) cannot hang the constructor; stopping the proxy
+        # closes the pipe, which ends the read.
+        lines: List[str] = []
+        reader = threading.Thread(
+            target=lambda: lines.append(self._kube_proxy.stdout.readline()),
+            daemon=True
+        )
+        reader.start()
+        reader.join(_KUBE_PROXY_START_TIMEOUT)
+        if not lines:
+            logger.warning(
+                f"kubectl proxy did not start within {_KUBE_PROXY_START_TIMEOUT:.0f}s; "
+                "verifying scenarios with kubectl"
+            )
+            self._stop_kube_proxy()
+            return
+
+        line = lines[0]
+        address = line.rsplit(" ", 1)[-1].strip()
+        if not line.startswith("Starting to serve on") or ":" not in address:
+            logger.warning("kubectl proxy did not start; verifying scenarios with kubectl")
+            self._stop_kube_proxy()
+            return
+
+        self.kube_client = httpx.AsyncClient(base_url=f"http://{address}", timeout=10.0)
+
+    def _stop_kube_proxy(self):
+        """Terminate the kubectl proxy process, if running."""
+        if self._kube_proxy is not None:
+            self._kube_proxy.terminate()
+            try:
+                self._kube_proxy.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._kube_proxy.kill()
+                self._kube_proxy.wait()
+            self._kube_proxy = None
 
     def load_scenario_setups(self, scenario_names: Optional[List[str]] = None) -> List[ScenarioSetup]:
         """Load scenario setup configurations."""
         setups = []
 
-        for script_path in sorted(self.scenarios_dir.glob("*.sh")):
+        # Directory order is filesystem-dependent; sort so scenarios always run
+        # in the same order and the experiment results line up between runs
+        with os.scandir(self.scenarios_dir) as it:
+            entries = sorted(
+                (entry for entry in it if entry.name.endswith(".sh") and entry.is_file()),
+                key=lambda entry: entry.name
+            )
+
+        for entry in entries:
+            script_path = Path(entry.path)
             name = script_path.stem
 
             # Filter by requested scenarios if specified
@@ -185,7 +375,7 @@ class IntegratedExperimentRunner:
                 continue
 
             # Extract namespace from script
-            content = script_path.read_text()
+            content = script_path.read_bytes()
             namespace = self._extract_namespace(content, name)
 
             setups.append(ScenarioSetup(
@@ -196,22 +386,20 @@ class IntegratedExperimentRunner:
 
         return setups
 
-    def _extract_namespace(self, content: str, name: str) -> str:
-        """Extract namespace from scenario script."""
-        import re
-
+    def _extract_namespace(self, content: bytes, name: str) -> str:
+        """Extract namespace from the raw bytes of a scenario script."""
         # Try to find NAMESPACE variable
-        namespace_match = re.search(r'NAMESPACE="?([^"\s]+)"?', content)
+        namespace_match = _NAMESPACE_VAR_RE.search(content)
         if namespace_match:
-            return namespace_match.group(1)
+            return namespace_match.group(1).decode(errors="replace")
 
         # Try to find kubectl create namespace command
-        namespace_match = re.search(r'create\s+namespace\s+([^\s]+)', content)
+        namespace_match = _CREATE_NAMESPACE_RE.search(content)
         if namespace_match:
-            return namespace_match.group(1)
+            return namespace_match.group(1).decode(errors="replace")
 
         # Fallback to generic name
-        scenario_num = re.search(r'^(\d+)-', name)
+        scenario_num = _SCENARIO_NUMBER_RE.match(name)
         if scenario_num:
             return f"test-ns-{scenario_num.group(1)}"
 
@@ -221,26 +409,47 @@ class IntegratedExperimentRunner:
         self,
         config: ExperimentConfig,
         scenario: ScenarioSetup,
-        inputs: Dict[str, Any]
+        inputs: Dict[str, Any],
+        slots: Optional[asyncio.Semaphore] = None
     ) -> Tuple[Dict[str, Any], bool]:
-        """Run a single test with scenario setup and cleanup."""
+        """Run a single test with scenario setup and cleanup.
 
-        # Setup scenario
-        setup_success = await asyncio.get_event_loop().run_in_executor(
-            self.executor, scenario.setup
-        )
+        If ``slots`` is given, a slot is held from setup until the test is done
+        and released before cleanup, so the next scenario can be set up while
+        this one is torn down.
+        """
+        set_up = False
+        try:
+            async with slots if slots is not None else contextlib.nullcontext():
+                # Setup scenario
+                set_up = await scenario.setup()
 
-        if not setup_success:
-            logger.error(f"Failed to setup scenario {scenario.name}")
-            return {
-                "error": "Scenario setup failed",
-                "scenario": scenario.name
-            }, False
+                if not set_up:
+                    logger.error(f"Failed to setup scenario {scenario.name}")
+                    return {
+                        "error": "Scenario setup failed",
+                        "scenario": scenario.name
+                    }, False
+
+                return await self._run_scenario_test(config, scenario, inputs)
+
+        finally:
+            # Always cleanup a scenario that was set up
+            if set_up:
+                cleanup_success = await scenario.cleanup()
 
+                if not cleanup_success:
+                    logger.warning(f"Cleanup failed for scenario {scenario.name}")
+
+    async def _run_scenario_test(
+        self,
+        config: ExperimentConfig,
+        scenario: ScenarioSetup,
+        inputs: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], bool]:
+        """Verify a set-up scenario and run the test against Kubently."""
         # Verify setup
-        verify_success = await asyncio.get_event_loop().run_in_executor(
-            self.executor, scenario.verify_setup
-        )
+        verify_success = await scenario.verify_setup(self.kube_client)
 
         if not verify_success:
             logger.warning(f"Scenario verification failed for {scenario.name}")
@@ -248,12 +457,12 @@ class IntegratedExperimentRunner:
         try:
             # Run the actual test against Kubently
             logger.info(f"Running test for scenario {scenario.name}")
-            response_text = ""
-            tools_used = []
+            stream = _StreamState()
 
             # Build prompt
-            prompt = PromptTemplate.from_template(config.prompt_template)
-            formatted_prompt = prompt.format(**inputs)
+            # Templates use {var} placeholders, so str.format_map fills them
+            # exactly as an f-string PromptTemplate would, without building one
+            formatted_prompt = config.prompt_template.format_map(inputs)
 
             if config.system_prompt:
                 formatted_prompt = f"{config.system_prompt}\n\n{formatted_prompt}"
@@ -274,41 +483,28 @@ class IntegratedExperimentRunner:
 
             async with self.http_client.stream("POST", "/", json=request) as response:
                 if response.status_code == 200:
-                    async for line in response.aiter_lines():
-                        if line.startswith("data: "):
+                    async for payload in _aiter_sse_data(response):
+                        # Only artifact and status updates carry anything we keep,
+                        # so skip heartbeats and other events without parsing them
+                        if b"artifact-update" in payload or b"status-update" in payload:
                             try:
-                                data = json.loads(line[6:])
+                                data = orjson.loads(payload)
                                 result = data.get("result", {})
 
-                                # Extract response text
-                                if result.get("kind") == "artifact-update":
-                                    artifact = result.get("artifact", {})
-                                    for part in artifact.get("parts", []):
-                                        if part.get("kind") == "text":
-                                            response_text = part.get("text", "")
-
-                                # Extract tool calls
-                                if result.get("kind") == "status-update":
-                                    message = result.get("status", {}).get("message", {})
-                                    if message and "parts" in message:
-                                        for part in message["parts"]:
-                                            if part.get("kind") == "text":
-                                                text = part.get("text", "")
-                                                if "🔧 Tool Call:" in text:
-                                                    import re
-                                                    tool_match = re.search(r'🔧 Tool Call: (\w+)', text)
-                                                    if tool_match:
-                                                        tools_used.append(tool_match.group(1))
-
-                            except json.JSONDecodeError:
+                                handler = _EVENT_HANDLERS.get(result.get("kind"))
+                                if handler is not None:
+                                    handler(result, stream)
+
+                            except orjson.JSONDecodeError:
                                 pass
 
             result = {
-                "response": response_text,
-                "tools_used": tools_used,
+                "response": stream.response_text,
+                "tools_used": stream.tools_used,
                 "scenario": scenario.name,
                 "namespace": scenario.namespace,
-                "timestamp": datetime.now().isoformat()
+                # Formatted only when the results are written out
+                "timestamp_ns": time.time_ns()
             }
 
             return result, True
@@ -320,14 +516,13 @@ class IntegratedExperimentRunner:
                 "scenario": scenario.name
             }, False
 
-        finally:
-            # Always cleanup
-            cleanup_success = await asyncio.get_event_loop().run_in_executor(
-                self.executor, scenario.cleanup
-            )
+    def _fetch_examples(self, dataset_name: str) -> List[Example]:
+        """Load all examples of a dataset by name."""
+        dataset = next(iter(self.client.list_datasets(dataset_name=dataset_name)), None)
+        if dataset is None:
+            raise ValueError(f"Dataset '{dataset_name}' not found")
 
-            if not cleanup_success:
-                logger.warning(f"Cleanup failed for scenario {scenario.name}")
+        return list(self.client.list_examples(dataset_id=dataset.id))
 
     async def run_experiment_with_scenarios(
         self,
@@ -338,81 +533,75 @@ class IntegratedExperimentRunner:
     ) -> Dict[str, Any]:
         """Run experiment with automatic scenario management."""
 
-        # Get dataset
-        datasets = list(self.client.list_datasets(dataset_name=dataset_name))
-        if not datasets:
-            raise ValueError(f"Dataset '{dataset_name}' not found")
-        dataset = datasets[0]
-
-        # Load examples from dataset
-        examples = list(self.client.list_examples(dataset_id=dataset.id))
+        # Fetch the examples and load scenario setups side by side, off the
+        # event loop; both are blocking and independent of each other
+        examples, setups = await asyncio.gather(
+            asyncio.to_thread(self._fetch_examples, dataset_name),
+            asyncio.to_thread(self.load_scenario_setups, scenario_names)
+        )
         logger.info(f"Found {len(examples)} examples in dataset")
-
-        # Load scenario setups
-        setups = self.load_scenario_setups(scenario_names)
         logger.info(f"Loaded {len(setups)} scenario setups")
 
         # Match examples to scenarios
         results = []
         semaphore = asyncio.Semaphore(max_concurrent_scenarios)
 
+        # Examples that share a scenario namespace run one after another, so a
+        # setup never races the previous run's cleanup of the same namespace
+        namespace_locks = defaultdict(asyncio.Lock)
+
         async def run_scenario_with_limit(example, scenario):
-            async with semaphore:
+            async with namespace_locks[scenario.namespace]:
                 return await self.run_single_test_with_scenario(
                     config,
                     scenario,
-                    example.inputs
+                    example.inputs,
+                    slots=semaphore
                 )
 
         # Process each example
+        setups_by_name = {setup.name: setup for setup in setups}
         tasks = []
+        scheduled = []  # (scenario_name, example) for each task, in task order
         for example in examples:
             # Find matching scenario
             scenario_name = example.inputs.get("metadata", {}).get("scenario_name")
-            matching_scenario = next(
-                (s for s in setups if s.name == scenario_name),
-                None
-            )
+            matching_scenario = setups_by_name.get(scenario_name)
 
             if not matching_scenario:
                 logger.warning(f"No scenario setup found for {scenario_name}")
                 continue
 
             tasks.append(run_scenario_with_limit(example, matching_scenario))
+            scheduled.append((scenario_name, example))
 
         # Run all tasks
+        successful = 0
+        total_score = 0.0
         if tasks:
             test_results = await asyncio.gather(*tasks)
 
-            # Evaluate results
-            for (result, success), example in zip(test_results, examples):
+            # Evaluate results, aggregating as we go
+            for (result, success), (scenario_name, example) in zip(test_results, scheduled):
                 if success:
                     evaluation = self.evaluate_result(result, example)
-                    results.append({
-                        "example": example.inputs.get("metadata", {}).get("scenario_name"),
-                        "result": result,
-                        "evaluation": evaluation,
-                        "success": success
-                    })
+                    successful += 1
                 else:
-                    results.append({
-                        "example": example.inputs.get("metadata", {}).get("scenario_name"),
-                        "result": result,
-                        "evaluation": {"score": 0, "error": "Test failed"},
-                        "success": success
-                    })
-
-        # Aggregate results
-        successful = sum(1 for r in results if r["success"])
-        average_score = sum(
-            r["evaluation"].get("score", 0) for r in results
-        ) / max(len(results), 1)
+                    evaluation = {"score": 0, "error": "Test failed"}
+                total_score += evaluation["score"]
+
+                results.append({
+                    "example": scenario_name,
+                    "result": result,
+                    "evaluation": evaluation,
+                    "success": success
+                })
 
         return {
-            "config": asdict(config) if hasattr(config, '__dataclass_fields__') else config,
+            "config": asdict(config),
             "total_scenarios": len(results),
             "successful": successful,
-            "average_score": average_score,
+            "average_score": total_score / max(len(results), 1),
             "results": results,
             "timestamp": datetime.now().isoformat()
         }
@@ -429,8 +618,7 @@ class IntegratedExperimentRunner:
 
         # Check if root cause mentioned
         response_lower = response.lower()
-        expected_lower = expected_fix.lower()
-        key_terms = expected_lower.split()[:5]  # First 5 words of expected fix
+        key_terms = _expected_key_terms(expected_fix)  # First 5 words of expected fix
 
         root_cause_score = sum(
             1 for term in key_terms if term in response_lower
@@ -440,7 +628,7 @@ class IntegratedExperimentRunner:
         # Check tool usage
         if required_tools:
             tool_score = len(
-                set(tools_used) & set(required_tools)
+                set(required_tools).intersection(tools_used)
             ) / len(required_tools)
             scores["tools"] = tool_score
         else:
@@ -458,7 +646,17 @@ class IntegratedExperimentRunner:
     async def close(self):
         """Cleanup resources."""
         await self.http_client.aclose()
-        self.executor.shutdown(wait=True)
+        if self.kube_client is not None:
+            await self.kube_client.aclose()
+        self._stop_kube_proxy()
+
+
+def _format_timestamps(results: Dict[str, Any]):
+    """Replace per-scenario ``timestamp_ns`` values with ISO timestamps."""
+    for r in results["results"]:
+        ns = r["result"].pop("timestamp_ns", None)
+        if ns is not None:
+            r["result"]["timestamp"] = datetime.fromtimestamp(ns / 1e9).isoformat()
 
 
 async def main():
@@ -507,16 +705,15 @@ Be specific and actionable in your response.
     )
 
     try:
-        # Check if Kubently is accessible
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(f"{args.api_url}/health", timeout=5.0)
-                if response.status_code != 200:
-                    logger.error("Kubently API not healthy")
-                    return
-            except:
-                logger.error("Cannot connect to Kubently API. Is it running?")
+        # Check if Kubently is accessible, reusing the runner's connection pool
+        try:
+            response = await runner.http_client.get(f"{args.api_url}/health", timeout=5.0)
+            if response.status_code != 200:
+                logger.error("Kubently API not healthy")
                 return
+        except:
+            logger.error("Cannot connect to Kubently API. Is it running?")
+            return
 
         # Run experiment
         logger.info("Starting integrated experiment with automatic scenario management")
@@ -543,8 +740,9 @@ Be specific and actionable in your response.
 
         # Save results
         output_file = f"integrated_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(output_file, "w") as f:
-            json.dump(results, f, indent=2, default=str)
+        _format_timestamps(results)
+        with open(output_file, "wb") as f:
+            f.write(orjson.dumps(results, default=str, option=orjson.OPT_INDENT_2))
 
         print(f"\nResults saved to: {output_file}")
 
@@ -553,4 +751,11 @@ Be specific and actionable in your response.
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    # uvloop's libuv loop cuts the per-callback cost of the many short awaits
+    # in scenario streaming and subprocess handling; it is optional
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
\ No newline at end of file
@@ -5,20 +5,25 @@ Tests prompts and configurations using simulated responses - no Kubernetes requi
 """
 
 import asyncio
+import contextlib
+import hashlib
 import json
 import os
 import random
 import time
 import uuid
+from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Callable, Tuple
 from dataclasses import dataclass, asdict
+from functools import lru_cache
 
 from dotenv import load_dotenv
 from langsmith import Client
 from langsmith.evaluation import aevaluate, EvaluationResult
 from langsmith.schemas import Run, Example
+import orjson
 
 # Load environment variables from .env file
 load_dotenv()
@@ -27,30 +32,12 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_anthropic import ChatAnthropic
 from langchain_openai import ChatOpenAI
 
+from experiment_runner import ResponseCache
 
-@dataclass
-class ExperimentConfig:
-    """Configuration for an experiment run."""
-    prompt_template: str
-    model_name: str
-    model_provider: str  # "gemini", "anthropic", "openai"
-    temperature: float = 0.7
-    max_tokens: int = 4096
-    system_prompt: Optional[str] = None
-    metadata: Dict[str, Any] = None
-
-
-class MockKubentlyAgent:
-    """Mocks Kubently agent responses based on scenario types."""
 
-    def __init__(self):
-        self.response_templates = self._load_response_templates()
-        self.tool_patterns = self._load_tool_patterns()
-
-    def _load_response_templates(self) -> Dict[str, str]:
-        """Load realistic response templates for different scenario types."""
-        return {
-            "image_pull": """
+# Realistic response templates for different scenario types
+_RESPONSE_TEMPLATES = {
+    "image_pull": """
 After investigating the issue in namespace {namespace}, I found that the pod is in ImagePullBackOff status.
 
 Root Cause: The image name contains a typo - it's trying to pull 'nginy:latest' instead of 'nginx:latest'.
@@ -62,7 +49,7 @@ kubectl patch deployment nginx-deployment -n {namespace} --type='json' -p='[{{"o
 
 This will update the deployment to use the correct image name. The pod should start successfully after this change.
 """,
-            "crash_loop": """
+    "crash_loop": """
 I've diagnosed the CrashLoopBackOff issue in namespace {namespace}.
 
 Root Cause: The application is crashing immediately on startup due to a missing required environment variable.
@@ -74,7 +61,7 @@ kubectl set env deployment/app-deployment -n {namespace} REQUIRED_VAR=value
 
 The container expects this environment variable to be set. After adding it, the pod should start normally.
 """,
-            "service_issue": """
+    "service_issue": """
 After checking the service configuration in namespace {namespace}, I identified the issue.
 
 Root Cause: The service selector doesn't match the pod labels. The service is looking for 'app=web' but the pods have 'app=webapp'.
@@ -86,7 +73,7 @@ kubectl patch service webapp-service -n {namespace} --type='json' -p='[{{"op": "
 
 This aligns the service selector with the actual pod labels, allowing traffic to reach the pods.
 """,
-            "rbac": """
+    "rbac": """
 I've analyzed the authorization issues in namespace {namespace}.
 
 Root Cause: The service account lacks the necessary permissions to access the required resources.
@@ -98,7 +85,7 @@ kubectl create rolebinding app-binding -n {namespace} --clusterrole=view --servi
 
 This grants the service account read permissions to the resources it needs.
 """,
-            "configmap": """
+    "configmap": """
 The pod in namespace {namespace} is failing to start due to configuration issues.
 
 Root Cause: The pod references a ConfigMap 'app-config' that doesn't exist in the namespace.
@@ -110,7 +97,7 @@ kubectl create configmap app-config -n {namespace} --from-literal=key=value
 
 Creating the missing ConfigMap will allow the pod to mount the configuration and start successfully.
 """,
-            "memory": """
+    "memory": """
 Investigation shows the pod in namespace {namespace} is being OOMKilled.
 
 Root Cause: The container is exceeding its memory limit of 128Mi. The application needs more memory to run.
@@ -122,7 +109,7 @@ kubectl patch deployment memory-app -n {namespace} --type='json' -p='[{{"op": "r
 
 Increasing the memory limit will prevent the OOM killer from terminating the container.
 """,
-            "general": """
+    "general": """
 I've investigated the issue in namespace {namespace}.
 
 After checking the pods, services, and events, I found that the main issue is related to resource configuration.
@@ -131,19 +118,103 @@ The problem has been identified and can be resolved by updating the deployment c
 
 Please check the pod status after applying the recommended changes.
 """
-        }
+}
+
+# Which tools are typically used for each scenario type
+_TOOL_PATTERNS = {
+    "image_pull": ["debug_resource", "get_pod_logs", "execute_kubectl"],
+    "crash_loop": ["get_pod_logs", "debug_resource", "execute_kubectl"],
+    "service_issue": ["debug_resource", "execute_kubectl"],
+    "rbac": ["debug_resource", "execute_kubectl"],
+    "configmap": ["debug_resource", "execute_kubectl"],
+    "memory": ["get_pod_logs", "debug_resource", "execute_kubectl"],
+    "general": ["debug_resource", "get_pod_logs"]
+}
+
+# (words in the expected fix, key terms the response should then mention)
+_KEY_TERM_RULES = (
+    (("image", "typo"), ("image", "typo", "nginx", "pull")),
+    (("crash",), ("crash", "environment", "variable", "exit")),
+    (("selector", "label"), ("selector", "label", "mismatch", "service")),
+    (("permission", "rbac"), ("permission", "rbac", "role", "authorization")),
+    (("configmap",), ("configmap", "missing", "configuration")),
+    (("memory", "oom"), ("memory", "oom", "limit", "resource")),
+)
+
+
+@lru_cache(maxsize=128)
+def _key_terms(expected_lower: str) -> Tuple[str, ...]:
+    """Key terms a response should mention for a (lowercased) expected fix."""
+    return tuple(
+        term
+        for triggers, terms in _KEY_TERM_RULES
+        if any(trigger in expected_lower for trigger in triggers)
+        for term in terms
+    )
+
+
+@dataclass
+class ExperimentConfig:
+    """Configuration for an experiment run."""
+    prompt_template: str
+    model_name: str
+    model_provider: str  # "gemini", "anthropic", "openai"
+    temperature: float = 0.7
+    max_tokens: int = 4096
+    system_prompt: Optional[str] = None
+    metadata: Dict[str, Any] = None
+    # Add 0.5-1.5s of fake agent latency per call; real LLM calls are slow enough,
+    # but the template fallback returns instantly without it
+    simulate_latency: bool = False
 
-    def _load_tool_patterns(self) -> Dict[str, List[str]]:
-        """Define which tools are typically used for each scenario type."""
-        return {
-            "image_pull": ["debug_resource", "get_pod_logs", "execute_kubectl"],
-            "crash_loop": ["get_pod_logs", "debug_resource", "execute_kubectl"],
-            "service_issue": ["debug_resource", "execute_kubectl"],
-            "rbac": ["debug_resource", "execute_kubectl"],
-            "configmap": ["debug_resource", "execute_kubectl"],
-            "memory": ["get_pod_logs", "debug_resource", "execute_kubectl"],
-            "general": ["debug_resource", "get_pod_logs"]
-        }
+
+def _create_gemini(config: ExperimentConfig):
+    """Create a Gemini chat model."""
+    return ChatGoogleGenerativeAI(
+        model=config.model_name,
+        temperature=config.temperature,
+        max_output_tokens=config.max_tokens
+    )
+
+
+def _create_anthropic(config: ExperimentConfig):
+    """Create an Anthropic Claude chat model."""
+    return ChatAnthropic(
+        model=config.model_name,
+        temperature=config.temperature,
+        max_tokens=config.max_tokens
+    )
+
+
+def _create_openai(config: ExperimentConfig):
+    """Create an OpenAI chat model."""
+    return ChatOpenAI(
+        model=config.model_name,
+        temperature=config.temperature,
+        max_tokens=config.max_tokens
+    )
+
+
+# Provider name -> chat model factory; add an entry to support a new provider
+_PROVIDER_FACTORIES: Dict[str, Callable[[ExperimentConfig], Any]] = {
+    "gemini": _create_gemini,
+    "anthropic": _create_anthropic,
+    "openai": _create_openai,
+}
+
+
+class MockKubentlyAgent:
+    """Mocks Kubently agent responses based on scenario types."""
+
+    def __init__(self, use_cache: bool = True, cache_dir: Path = Path(".kubently_cache") / "mocked"):
+        self.response_templates = _RESPONSE_TEMPLATES
+        self.tool_patterns = _TOOL_PATTERNS
+        # Chat models by (provider, model, temperature, max_tokens), see _get_model
+        self._llm_cache: Dict[tuple, Any] = {}
+        # LLM responses on disk by hash of the config and guided prompt, so a
+        # re-run of the same sweep replays them; see _response_cache_key
+        self.use_cache = use_cache
+        self.response_cache = ResponseCache(cache_dir)
 
     async def generate_response(
         self,
@@ -155,7 +226,8 @@ Please check the pod status after applying the recommended changes.
         """Generate a mocked response based on the scenario."""
 
         # Simulate processing time
-        await asyncio.sleep(random.uniform(0.5, 1.5))
+        if config.simulate_latency:
+            await asyncio.sleep(random.uniform(0.5, 1.5))
 
         # Get template for this scenario type
         template = self.response_templates.get(
@@ -169,10 +241,6 @@ Please check the pod status after applying the recommended changes.
             self.tool_patterns["general"]
         )
 
-        # Use the actual LLM to generate a response based on our template
-        # This allows us to test how different models interpret the same problem
-        model = self._create_model(config)
-
         # Create a prompt that guides the model to respond appropriately
         guided_prompt = f"""
 {config.system_prompt if config.system_prompt else ''}
@@ -191,26 +259,11 @@ Remember to:
 3. Explain why the fix works
 """
 
-        # Get response from actual LLM
-        if config.model_provider == "gemini":
-            llm = ChatGoogleGenerativeAI(
-                model=config.model_name,
-                temperature=config.temperature,
-                max_output_tokens=config.max_tokens
-            )
-        elif config.model_provider == "anthropic":
-            llm = ChatAnthropic(
-                model=config.model_name,
-                temperature=config.temperature,
-                max_tokens=config.max_tokens
-            )
-        elif config.model_provider == "openai":
-            llm = ChatOpenAI(
-                model=config.model_name,
-                temperature=config.temperature,
-                max_tokens=config.max_tokens
-            )
-        else:
+        # Use the actual LLM to generate a response based on our template
+        # This allows us to test how different models interpret the same problem
+        try:
+            llm = self._get_model(config)
+        except ValueError:
             # Fallback to template
             response_text = template.format(namespace=namespace)
             return {
@@ -219,13 +272,26 @@ Remember to:
                 "mocked": True
             }
 
-        try:
-            # Get actual LLM response
-            response = await llm.ainvoke(guided_prompt)
-            response_text = response.content
-        except Exception as e:
-            # Fallback to template if LLM fails
-            response_text = template.format(namespace=namespace)
+        response_text = None
+        key = None
+        if self.use_cache:
+            key = self._response_cache_key(config, guided_prompt)
+            cached = await asyncio.to_thread(self.response_cache.get, key)
+            if cached is not None:
+                response_text = cached["response"]
+        if response_text is None:
+            try:
+                # Get actual LLM response
+                response = await llm.ainvoke(guided_prompt)
+                response_text = response.content
+            except Exception as e:
+                # Fallback to template if LLM fails; not cached, so a later call retries
+                response_text = template.format(namespace=namespace)
+            else:
+                if key is not None:
+                    # A failed cache write only costs a later cache miss
+                    with contextlib.suppress(OSError):
+                        await asyncio.to_thread(self.response_cache.set, key, {"response": response_text})
 
         return {
             "response": response_text,
@@ -236,41 +302,59 @@ Remember to:
             "mocked": True
         }
 
+    @staticmethod
+    def _response_cache_key(config: ExperimentConfig, guided_prompt: str) -> str:
+        """Hash the guided prompt with every config field that shapes a response.
+
+        The guided prompt does not include ``prompt_template``, so the template
+        is hashed separately to keep prompt variants of one model apart.
+        """
+        payload = json.dumps(
+            [
+                config.model_provider,
+                config.model_name,
+                config.temperature,
+                config.max_tokens,
+                config.system_prompt,
+                config.prompt_template,
+                guided_prompt,
+            ]
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _get_model(self, config: ExperimentConfig):
+        """Return the chat model for a configuration, building it on first use."""
+        key = (config.model_provider, config.model_name, config.temperature, config.max_tokens)
+        llm = self._llm_cache.get(key)
+        if llm is None:
+            llm = self._llm_cache[key] = self._create_model(config)
+        return llm
+
     def _create_model(self, config: ExperimentConfig):
         """Create a language model based on configuration."""
-        if config.model_provider == "gemini":
-            return ChatGoogleGenerativeAI(
-                model=config.model_name,
-                temperature=config.temperature,
-                max_output_tokens=config.max_tokens
-            )
-        elif config.model_provider == "anthropic":
-            return ChatAnthropic(
-                model=config.model_name,
-                temperature=config.temperature,
-                max_tokens=config.max_tokens
-            )
-        elif config.model_provider == "openai":
-            return ChatOpenAI(
-                model=config.model_name,
-                temperature=config.temperature,
-                max_tokens=config.max_tokens
-            )
-        else:
-            raise ValueError(f"Unknown model provider: {config.model_provider}")
+        try:
+            factory = _PROVIDER_FACTORIES[config.model_provider]
+        except KeyError:
+            raise ValueError(f"Unknown model provider: {config.model_provider}") from None
+        return factory(config)
 
 
 class MockedExperimentRunner:
     """Runs experiments with mocked Kubently responses."""
 
-    def __init__(self, langsmith_api_key: Optional[str] = None):
+    def __init__(
+        self,
+        langsmith_api_key: Optional[str] = None,
+        use_cache: bool = True
+    ):
         self.langsmith_api_key = langsmith_api_key or os.getenv("LANGSMITH_API_KEY")
 
         if not self.langsmith_api_key:
             raise ValueError("LANGSMITH_API_KEY environment variable is required")
 
         self.client = Client(api_key=self.langsmith_api_key)
-        self.mock_agent = MockKubentlyAgent()
+        self.mock_agent = MockKubentlyAgent(use_cache=use_cache)
+        self._dataset_cache: Dict[str, Any] = {}
 
     async def run_single_test(
         self,
@@ -318,19 +402,7 @@ class MockedExperimentRunner:
         expected_lower = expected_fix.lower()
 
         # Extract key terms from expected fix
-        key_terms = []
-        if "image" in expected_lower or "typo" in expected_lower:
-            key_terms.extend(["image", "typo", "nginx", "pull"])
-        if "crash" in expected_lower:
-            key_terms.extend(["crash", "environment", "variable", "exit"])
-        if "selector" in expected_lower or "label" in expected_lower:
-            key_terms.extend(["selector", "label", "mismatch", "service"])
-        if "permission" in expected_lower or "rbac" in expected_lower:
-            key_terms.extend(["permission", "rbac", "role", "authorization"])
-        if "configmap" in expected_lower:
-            key_terms.extend(["configmap", "missing", "configuration"])
-        if "memory" in expected_lower or "oom" in expected_lower:
-            key_terms.extend(["memory", "oom", "limit", "resource"])
+        key_terms = _key_terms(expected_lower)
 
         # Count matching key terms
         if key_terms:
@@ -399,6 +471,14 @@ class MockedExperimentRunner:
             comment="; ".join(feedback) if feedback else "All checks passed"
         )
 
+    def _resolve_dataset(self, dataset_name: str):
+        """Look up a dataset by name and remember it for later runs."""
+        dataset = next(iter(self.client.list_datasets(dataset_name=dataset_name)), None)
+        if dataset is None:
+            raise ValueError(f"Dataset '{dataset_name}' not found")
+        self._dataset_cache[dataset_name] = dataset
+        return dataset
+
     async def run_experiment(
         self,
         dataset_name: str,
@@ -406,52 +486,55 @@ class MockedExperimentRunner:
         experiment_prefix: str = "mocked-kubently",
         max_concurrency: int = 5
     ) -> List[Dict[str, Any]]:
-        """Run experiments with multiple configurations."""
-        results = []
+        """Run experiments with multiple configurations.
 
+        Configurations for different providers share no rate limit, so they
+        run concurrently. Configurations for the same provider take turns, so
+        each provider still sees at most ``max_concurrency`` requests at a time.
+        Results keep the order of ``configs``.
+        """
         # Get dataset
-        datasets = list(self.client.list_datasets(dataset_name=dataset_name))
-        if not datasets:
-            raise ValueError(f"Dataset '{dataset_name}' not found")
-        dataset = datasets[0]
+        dataset = self._dataset_cache.get(dataset_name) or self._resolve_dataset(dataset_name)
 
         print(f"Running mocked experiments on dataset: {dataset_name}")
         print(f"Testing {len(configs)} configurations")
 
-        for i, config in enumerate(configs, 1):
-            experiment_name = f"{experiment_prefix}-{i}-{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            print(f"\n[{i}/{len(configs)}] Running configuration: {config.metadata.get('variant', config.model_name)}")
-
-            # Create test function
-            test_fn = self.create_test_function(config)
-
-            # Run evaluation
-            eval_results = await aevaluate(
-                test_fn,
-                data=dataset_name,
-                evaluators=[self.evaluate_response],
-                experiment=experiment_name,
-                max_concurrency=max_concurrency,
-                metadata={
-                    "config": asdict(config) if hasattr(config, '__dataclass_fields__') else config,
-                    "timestamp": datetime.now().isoformat(),
-                    "mocked": True
-                }
-            )
+        provider_locks = defaultdict(asyncio.Lock)
+
+        async def run_one(i: int, config: ExperimentConfig) -> Dict[str, Any]:
+            async with provider_locks[config.model_provider]:
+                experiment_name = f"{experiment_prefix}-{i}-{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+                print(f"\n[{i}/{len(configs)}] Running configuration: {config.metadata.get('variant', config.model_name)}")
+
+                # Create test function
+                test_fn = self.create_test_function(config)
+
+                # Run evaluation
+                eval_results = await aevaluate(
+                    test_fn,
+                    data=dataset.id,
+                    evaluators=[self.evaluate_response],
+                    experiment=experiment_name,
+                    max_concurrency=max_concurrency,
+                    metadata={
+                        "config": asdict(config) if hasattr(config, '__dataclass_fields__') else config,
+                        "timestamp": datetime.now().isoformat(),
+                        "mocked": True
+                    }
+                )
+
+            print(f"  [{i}/{len(configs)}] Completed. View at: https://smith.langchain.com/experiments/{experiment_name}")
 
             # Collect results
-            result_summary = {
+            return {
                 "experiment_name": experiment_name,
                 "config": config,
                 "results": eval_results,
                 "timestamp": datetime.now().isoformat(),
                 "mocked": True
             }
-            results.append(result_summary)
-
-            print(f"  Completed. View at: https://smith.langchain.com/experiments/{experiment_name}")
 
-        return results
+        return list(await asyncio.gather(*(run_one(i, config) for i, config in enumerate(configs, 1))))
 
 
 def create_test_configurations() -> List[ExperimentConfig]:
@@ -532,10 +615,11 @@ async def main():
     parser.add_argument("--dataset", required=True, help="Dataset name")
     parser.add_argument("--experiment-prefix", default="mocked-exp", help="Experiment prefix")
     parser.add_argument("--max-concurrency", type=int, default=5, help="Max concurrent tests")
+    parser.add_argument("--no-cache", action="store_true", help="Call the LLM for every example instead of replaying responses cached by earlier runs")
 
     args = parser.parse_args()
 
-    runner = MockedExperimentRunner()
+    runner = MockedExperimentRunner(use_cache=not args.no_cache)
 
     # Create test configurations
     configs = create_test_configurations()
@@ -572,8 +656,8 @@ async def main():
 
     # Save results
     output_file = f"mocked_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    with open(output_file, "w") as f:
-        json.dump(results, f, indent=2, default=str)
+    with open(output_file, "wb") as f:
+        f.write(orjson.dumps(results, default=str, option=orjson.OPT_INDENT_2))
 
     print(f"\nResults saved to: {output_file}")
     print("\nNote: This was a MOCKED experiment - no real Kubernetes clusters were used")
@@ -162,18 +162,18 @@ EOF
 
     results)
         echo "Recent experiment results:"
-        ls -la experiment_results_*.json 2>/dev/null || echo "No results found"
+        ls -la experiment_results_*.jsonl 2>/dev/null || echo "No results found"
 
-        if [ -f experiment_results_*.json ]; then
+        latest=$(ls -t experiment_results_*.jsonl 2>/dev/null | head -1)
+        if [ -n "$latest" ]; then
             echo -e "\n${GREEN}Latest results:${NC}"
-            latest=$(ls -t experiment_results_*.json | head -1)
-            python3 -c "import json; import sys; data=json.load(open('$latest')); print(json.dumps(data, indent=2)[:1000])"
+            python3 -c "import json; data=[json.loads(line) for line in open('$latest')]; print(json.dumps(data, indent=2)[:1000])"
         fi
         ;;
 
     clean)
         echo "Cleaning up experiment artifacts..."
-        rm -f experiment_results_*.json
+        rm -f experiment_results_*.json experiment_results_*.jsonl
         rm -f experiment_configs.json
         rm -f *.json.backup
         echo -e "${GREEN}✓ Cleanup complete${NC}"
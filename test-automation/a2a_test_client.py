@@ -5,6 +5,7 @@ Uses httpx directly to implement the A2A protocol.
 """
 
 import asyncio
+import contextlib
 import json
 import sys
 import uuid
@@ -16,25 +17,147 @@ except ImportError:
     print("Error: httpx not installed. Install with: pip install httpx")
     sys.exit(1)
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+async def _iter_sse_data(response):
+    """Yield the bytes payload of each ``data:`` line in an SSE response.
+
+    Same splitter as ``_aiter_sse_data`` in
+    langsmith-experiments/integrated_experiment_runner.py, which documents
+    it; test-automation cannot import from there, so keep the two in sync.
+    """
+    buffer = bytearray()
+    async for chunk in response.aiter_bytes():
+        buffer += chunk
+        start = 0
+        while (end := buffer.find(b"\n", start)) != -1:
+            if buffer.startswith(b"data: ", start, end):
+                yield bytes(buffer[start + 6:end])
+            start = end + 1
+        del buffer[:start]
+
+    if buffer.startswith(b"data: "):
+        yield bytes(buffer[6:])
+
+
+def _handle_status_update(event_result: dict, result: dict):
+    """Collect message text from a status update; tool-call notices are kept apart."""
+    message = event_result.get("status", {}).get("message", {})
+    if message and "parts" in message:
+        for part in message["parts"]:
+            if part.get("kind") == "text":
+                text = part.get("text", "")
+                if text:
+                    # Check if this is a tool call message
+                    if "🔧 Tool Call:" in text:
+                        result["tool_calls"].append({
+                            "type": "embedded",
+                            "content": text,
+                            "timestamp": event_result.get("timestamp", "")
+                        })
+                    else:
+                        result["final_text"] = text
+                        result["all_responses"].append({
+                            "type": "message",
+                            "text": text
+                        })
+
+
+def _handle_artifact_update(event_result: dict, result: dict):
+    """Collect artifact text; the latest one becomes the final text."""
+    artifact = event_result.get("artifact", {})
+    if "parts" in artifact:
+        for part in artifact["parts"]:
+            if part.get("kind") == "text":
+                text = part.get("text", "")
+                if text:
+                    result["final_text"] = text
+                    result["artifacts"].append({
+                        "type": "artifact",
+                        "text": text
+                    })
+
+
+def _handle_tool_call(event_result: dict, result: dict):
+    """Record a tool call."""
+    tool_call = event_result.get("toolCall", {})
+    result["tool_calls"].append({
+        "timestamp": event_result.get("timestamp", ""),
+        "tool": tool_call.get("tool", "unknown"),
+        "args": tool_call.get("parameters", {}),
+        "result": None  # Will be updated when tool-response is received
+    })
+
+
+def _handle_tool_response(event_result: dict, result: dict):
+    """Attach a tool response to the last recorded tool call."""
+    tool_response = event_result.get("toolResponse", {})
+    if result["tool_calls"]:
+        result["tool_calls"][-1]["result"] = tool_response.get("content", "")
+
+
+def _handle_thinking(event_result: dict, result: dict):
+    """Record a thinking step."""
+    thinking = event_result.get("thinking", {})
+    if "content" in thinking:
+        result["thinking_steps"].append(thinking["content"])
+
+
+# Event kind -> handler, looked up once per SSE event
+_EVENT_HANDLERS = {
+    "status-update": _handle_status_update,
+    "artifact-update": _handle_artifact_update,
+    "tool-call": _handle_tool_call,
+    "tool-response": _handle_tool_response,
+    "thinking": _handle_thinking,
+}
+
+
+def build_client(timeout: int = 30) -> httpx.AsyncClient:
+    """Create a pooled HTTP/2 client to share across send_a2a_message calls.
+
+    Only pool and protocol settings live here; send_a2a_message supplies the
+    URL and API key per call. Needs the ``h2`` package
+    (``pip install httpx[http2]``). The caller owns the client and closes it
+    with ``aclose()``.
+    """
+    return httpx.AsyncClient(
+        timeout=timeout,
+        limits=httpx.Limits(max_keepalive_connections=20),
+        http2=True
+    )
+
 
 async def send_a2a_message(
     base_url: str,
     api_key: str,
     query: str,
-    timeout: int = 30
+    timeout: int = 30,
+    client: Optional[httpx.AsyncClient] = None
 ) -> dict:
-    """Send a message via A2A protocol and collect the response."""
+    """Send a message via A2A protocol and collect the response.
+
+    Pass ``client`` (see build_client) to reuse its connections across
+    calls; otherwise a client is created and closed for this call.
+    """
     
     # Ensure URL ends with /a2a
     if not base_url.endswith('/a2a'):
         base_url = base_url.rstrip('/') + '/a2a'
     
-    # Create HTTP client
-    async with httpx.AsyncClient(
-        base_url=base_url,
-        headers={"X-API-Key": api_key},
-        timeout=timeout
-    ) as client:
+    # Create HTTP client unless one was passed in
+    if client is None:
+        client_context = build_client(timeout)
+    else:
+        client_context = contextlib.nullcontext(client)
+
+    async with client_context as client:
         # Create A2A message
         request = {
             "jsonrpc": "2.0",
@@ -65,89 +188,40 @@ async def send_a2a_message(
         
         try:
             # Send message and process streaming response
-            async with client.stream("POST", "/", json=request) as response:
+            async with client.stream(
+                "POST",
+                base_url + "/",
+                json=request,
+                headers={"X-API-Key": api_key},
+                timeout=timeout
+            ) as response:
                 if response.status_code != 200:
                     result["status"] = "error"
                     result["error"] = f"HTTP {response.status_code}"
                     return result
                 
                 # Process SSE stream
-                async for line in response.aiter_lines():
-                    if line.startswith("data: "):
-                        try:
-                            data = json.loads(line[6:])
-                            if "result" in data:
-                                event_result = data["result"]
-                                
-                                # Get context ID from first response
-                                if not result["context_id"] and "contextId" in event_result:
-                                    result["context_id"] = event_result["contextId"]
-                                
-                                # Check for text in status updates
-                                if event_result.get("kind") == "status-update":
-                                    message = event_result.get("status", {}).get("message", {})
-                                    if message and "parts" in message:
-                                        for part in message["parts"]:
-                                            if part.get("kind") == "text":
-                                                text = part.get("text", "")
-                                                if text:
-                                                    # Check if this is a tool call message
-                                                    if "🔧 Tool Call:" in text:
-                                                        result["tool_calls"].append({
-                                                            "type": "embedded",
-                                                            "content": text,
-                                                            "timestamp": event_result.get("timestamp", "")
-                                                        })
-                                                    else:
-                                                        result["final_text"] = text
-                                                        result["all_responses"].append({
-                                                            "type": "message",
-                                                            "text": text
-                                                        })
-                                
-                                # Check for artifact updates
-                                elif event_result.get("kind") == "artifact-update":
-                                    artifact = event_result.get("artifact", {})
-                                    if "parts" in artifact:
-                                        for part in artifact["parts"]:
-                                            if part.get("kind") == "text":
-                                                text = part.get("text", "")
-                                                if text:
-                                                    result["final_text"] = text
-                                                    result["artifacts"].append({
-                                                        "type": "artifact",
-                                                        "text": text
-                                                    })
-                                
-                                # Check for tool calls
-                                elif event_result.get("kind") == "tool-call":
-                                    tool_call = event_result.get("toolCall", {})
-                                    result["tool_calls"].append({
-                                        "timestamp": event_result.get("timestamp", ""),
-                                        "tool": tool_call.get("tool", "unknown"),
-                                        "args": tool_call.get("parameters", {}),
-                                        "result": None  # Will be updated when tool-response is received
-                                    })
-                                
-                                # Check for tool responses
-                                elif event_result.get("kind") == "tool-response":
-                                    tool_response = event_result.get("toolResponse", {})
-                                    # Update the last tool call with the response
-                                    if result["tool_calls"]:
-                                        result["tool_calls"][-1]["result"] = tool_response.get("content", "")
-                                
-                                # Check for thinking steps
-                                elif event_result.get("kind") == "thinking":
-                                    thinking = event_result.get("thinking", {})
-                                    if "content" in thinking:
-                                        result["thinking_steps"].append(thinking["content"])
-                                
-                                # Check if completed
-                                if event_result.get("kind") == "status-update" and event_result.get("final"):
-                                    if event_result.get("status", {}).get("state") == "completed":
-                                        break
-                        except json.JSONDecodeError:
-                            pass
+                async for payload in _iter_sse_data(response):
+                    try:
+                        data = _json_loads(payload)
+                        if "result" in data:
+                            event_result = data["result"]
+                            
+                            # Get context ID from first response
+                            if not result["context_id"] and "contextId" in event_result:
+                                result["context_id"] = event_result["contextId"]
+                            
+                            kind = event_result.get("kind")
+                            handler = _EVENT_HANDLERS.get(kind)
+                            if handler is not None:
+                                handler(event_result, result)
+                            
+                            # Check if completed
+                            if kind == "status-update" and event_result.get("final"):
+                                if event_result.get("status", {}).get("state") == "completed":
+                                    break
+                    except json.JSONDecodeError:
+                        pass
                             
         except Exception as e:
             result["status"] = "error"
@@ -169,7 +243,10 @@ async def main():
     result = await send_a2a_message(base_url, api_key, query)
     
     # Output JSON result
-    print(json.dumps(result, indent=2))
+    if orjson is not None:
+        sys.stdout.buffer.write(orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+    else:
+        print(json.dumps(result, indent=2))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,127 @@
+"""
+Unit tests for the mocked agent narratives in enhanced_mocked_data.
+
+get_response_narrative renders per-scenario templates built once, instead of
+assembling the narrative on every call. These tests pin the output for each
+scenario type to the original step-by-step assembly, reproduced below.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+# langsmith-experiments is a script directory, not a package
+sys.path.insert(0, str(ROOT / "langsmith-experiments"))
+
+import enhanced_mocked_data
+from enhanced_mocked_data import EnhancedMockData, get_response_narrative, get_workflow
+
+SCENARIO_TYPES = ["image_pull", "crash_loop", "service_issue", "rbac", "configmap", "memory"]
+
+
+def reference_narrative(scenario_type: str, namespace: str) -> str:
+    """The narrative as EnhancedMockData.get_response_narrative first built it."""
+    workflow = get_workflow(scenario_type)
+
+    narrative_parts = [
+        f"I've investigated the issue in namespace {namespace}. Here's what I found:\n"
+    ]
+
+    if scenario_type == "image_pull":
+        narrative_parts.append("**Root Cause**: The deployment is trying to pull a non-existent image 'nginy:latest' (typo in nginx).")
+    elif scenario_type == "crash_loop":
+        narrative_parts.append("**Root Cause**: The application is crashing due to a missing DATABASE_URL environment variable.")
+    elif scenario_type == "service_issue":
+        narrative_parts.append("**Root Cause**: The service selector 'app=web' doesn't match the pod labels 'app=webapp'.")
+    elif scenario_type == "rbac":
+        narrative_parts.append("**Root Cause**: The service account lacks permissions to list pods in the namespace.")
+    elif scenario_type == "configmap":
+        narrative_parts.append("**Root Cause**: The pod references a ConfigMap 'app-config' that doesn't exist.")
+    elif scenario_type == "memory":
+        narrative_parts.append("**Root Cause**: The container is being OOMKilled due to insufficient memory limit (128Mi).")
+
+    narrative_parts.append(f"\n**Diagnostic Steps** ({len(workflow)} commands executed):")
+    for i, step in enumerate(workflow[:3], 1):
+        narrative_parts.append(f"{i}. {step.purpose}")
+
+    fix_steps = [s for s in workflow if "fix" in s.purpose.lower() or "patch" in s.command or "create" in s.command]
+    if fix_steps:
+        narrative_parts.append(f"\n**Fix Applied**:\n```bash\n{fix_steps[0].command}\n```")
+
+    narrative_parts.append("\n**Verification**: The issue has been resolved and the pod is now running successfully.")
+
+    return "\n".join(narrative_parts)
+
+
+# =============================================================================
+# Narrative Tests
+# =============================================================================
+
+
+class TestGetResponseNarrative:
+    """Tests for get_response_narrative."""
+
+    def test_covers_every_workflow(self):
+        """The scenario list below tracks the workflows the module defines."""
+        assert sorted(SCENARIO_TYPES) == sorted(enhanced_mocked_data._WORKFLOWS)
+
+    @pytest.mark.parametrize("scenario_type", SCENARIO_TYPES)
+    def test_matches_reference(self, scenario_type):
+        """Each scenario type renders exactly the original narrative."""
+        assert get_response_narrative(scenario_type, "test-ns-1") == reference_narrative(
+            scenario_type, "test-ns-1"
+        )
+
+    @pytest.mark.parametrize("scenario_type", SCENARIO_TYPES)
+    def test_root_cause_and_fix(self, scenario_type):
+        """Every shipped scenario reports a root cause and a fix command."""
+        narrative = get_response_narrative(scenario_type, "test-ns-1")
+        assert "**Root Cause**:" in narrative
+        assert "**Fix Applied**:\n```bash\n" in narrative
+
+    def test_unknown_scenario_falls_back_to_image_pull_steps(self):
+        """Unknown types reuse the image_pull workflow without its root cause."""
+        narrative = get_response_narrative("no-such-scenario", "test-ns-1")
+
+        assert narrative == reference_narrative("no-such-scenario", "test-ns-1")
+        assert "**Root Cause**" not in narrative
+        assert get_workflow("image_pull")[0].purpose in narrative
+
+    @pytest.mark.parametrize("namespace", ["ns-$HOME", "ns-${namespace}", "ns-{namespace}", "ns-%s"])
+    def test_namespace_inserted_literally(self, namespace):
+        """Template syntax in the namespace is not expanded."""
+        for scenario_type in SCENARIO_TYPES:
+            assert get_response_narrative(scenario_type, namespace) == reference_narrative(
+                scenario_type, namespace
+            )
+
+    def test_fix_commands_keep_dollar_signs(self):
+        """'$' in workflow commands survives the template escaping."""
+        step = enhanced_mocked_data.DebugStep(
+            tool="execute_kubectl",
+            command="kubectl patch deployment web -p '{\"spec\": {\"replicas\": $REPLICAS}}'",
+            purpose="Apply the fix",
+            output="patched",
+        )
+        template = enhanced_mocked_data._build_narrative_template((step,), None)
+
+        assert "$REPLICAS" in template.substitute(namespace="test-ns-1")
+
+    def test_namespaces_render_separately(self):
+        """Cached renders for one namespace do not leak into another."""
+        first = get_response_narrative("crash_loop", "ns-a")
+        second = get_response_narrative("crash_loop", "ns-b")
+
+        assert "namespace ns-a" in first
+        assert "namespace ns-b" in second
+        assert first.replace("ns-a", "ns-b") == second
+
+    def test_class_wrapper_matches_module_function(self):
+        """EnhancedMockData keeps returning what the module function does."""
+        mock_data = EnhancedMockData()
+        for scenario_type in SCENARIO_TYPES:
+            assert mock_data.get_response_narrative(scenario_type, "test-ns-1") == (
+                get_response_narrative(scenario_type, "test-ns-1")
+            )
@@ -0,0 +1,177 @@
+"""
+Unit tests for the on-disk ResponseCache of the LangSmith experiment runner.
+
+Tests cover:
+- Cache key stability and which request fields change the key
+- get/set round trips, misses and corrupt entries
+- Atomic replacement under concurrent writers
+"""
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+
+import pytest
+
+# langsmith-experiments is a script directory, not a package
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "langsmith-experiments"),
+)
+
+experiment_runner = pytest.importorskip("experiment_runner")
+ExperimentConfig = experiment_runner.ExperimentConfig
+ResponseCache = experiment_runner.ResponseCache
+
+API_URL = "http://localhost:8080"
+
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+
+@pytest.fixture
+def config():
+    """A sampled config like the defaults the runner ships with."""
+    return ExperimentConfig(
+        prompt_template="Investigate: {query}",
+        model_name="gemini-2.0-flash-exp",
+        model_provider="gemini",
+        temperature=0.3,
+        system_prompt="You are a Kubernetes debugging assistant.",
+    )
+
+
+@pytest.fixture
+def inputs():
+    return {"query": "Pod is in CrashLoopBackOff", "namespace": "test-ns"}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(tmp_path / "cache")
+
+
+# =============================================================================
+# Key Tests
+# =============================================================================
+
+
+class TestMakeKey:
+    """Tests for ResponseCache.make_key."""
+
+    def test_same_request_gives_same_key(self, config, inputs):
+        """Equal configs and inputs hash to the same key."""
+        assert ResponseCache.make_key(config, inputs, API_URL) == ResponseCache.make_key(
+            replace(config), dict(inputs), API_URL
+        )
+
+    def test_key_ignores_input_order(self, config, inputs):
+        """Input dicts built in a different order share a key."""
+        reordered = dict(reversed(list(inputs.items())))
+        assert ResponseCache.make_key(config, inputs, API_URL) == ResponseCache.make_key(
+            config, reordered, API_URL
+        )
+
+    def test_key_is_a_file_name(self, config, inputs):
+        """Keys are hex digests, safe to use as file names."""
+        key = ResponseCache.make_key(config, inputs, API_URL)
+        assert len(key) == 64
+        assert all(c in "0123456789abcdef" for c in key)
+
+    def test_api_url_changes_key(self, config, inputs):
+        """Responses from another deployment are not reused."""
+        assert ResponseCache.make_key(config, inputs, API_URL) != ResponseCache.make_key(
+            config, inputs, "http://kubently.example.com"
+        )
+
+    @pytest.mark.parametrize(
+        "field,value",
+        [
+            ("model_provider", "openai"),
+            ("model_name", "gemini-1.5-pro"),
+            ("temperature", 0.7),
+            ("max_tokens", 1024),
+            ("system_prompt", "Be brief."),
+            ("prompt_template", "Debug: {query}"),
+        ],
+    )
+    def test_config_fields_change_key(self, config, inputs, field, value):
+        """Every config field that shapes a response is part of the key."""
+        assert ResponseCache.make_key(config, inputs, API_URL) != ResponseCache.make_key(
+            replace(config, **{field: value}), inputs, API_URL
+        )
+
+    def test_inputs_change_key(self, config, inputs):
+        """A different example gets its own entry."""
+        other = {**inputs, "namespace": "other-ns"}
+        assert ResponseCache.make_key(config, inputs, API_URL) != ResponseCache.make_key(
+            config, other, API_URL
+        )
+
+
+# =============================================================================
+# Storage Tests
+# =============================================================================
+
+
+class TestGetSet:
+    """Tests for ResponseCache.get and ResponseCache.set."""
+
+    def test_get_miss_returns_none(self, cache):
+        """A missing entry (and a missing cache dir) is a miss."""
+        assert cache.get("0" * 64) is None
+
+    def test_set_then_get(self, cache):
+        """Stored entries read back unchanged."""
+        value = {"response": "The image tag does not exist.", "tool_calls": [{"tool": "kubectl"}]}
+        cache.set("abc", value)
+        assert cache.get("abc") == value
+
+    def test_set_replaces_entry(self, cache):
+        """A second write to a key wins."""
+        cache.set("abc", {"response": "first"})
+        cache.set("abc", {"response": "second"})
+        assert cache.get("abc") == {"response": "second"}
+
+    def test_corrupt_entry_is_a_miss(self, cache):
+        """A truncated file is treated as a miss rather than raising."""
+        cache.cache_dir.mkdir(parents=True)
+        (cache.cache_dir / "abc.json").write_text('{"response": "trunc')
+        assert cache.get("abc") is None
+
+    def test_set_leaves_no_temp_files(self, cache):
+        """Only the final entry is left in the cache dir."""
+        cache.set("abc", {"response": "ok"})
+        assert sorted(p.name for p in cache.cache_dir.iterdir()) == ["abc.json"]
+
+    def test_concurrent_writers(self, cache):
+        """Concurrent writes of one key never fail or leave a partial file."""
+        values = [{"response": f"answer {i}" * 1000} for i in range(32)]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda value: cache.set("abc", value), values))
+
+        assert cache.get("abc") in values
+        assert sorted(p.name for p in cache.cache_dir.iterdir()) == ["abc.json"]
+
+    def test_reader_never_sees_partial_entry(self, cache):
+        """Reads racing a writer see either the old or the new entry."""
+        old, new = {"response": "old" * 5000}, {"response": "new" * 5000}
+        cache.set("abc", old)
+
+        def write():
+            for _ in range(50):
+                cache.set("abc", new)
+                cache.set("abc", old)
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            writer = pool.submit(write)
+            seen = []
+            while not writer.done():
+                seen.append(cache.get("abc"))
+            writer.result()
+
+        assert all(entry in (old, new) for entry in seen)
@@ -0,0 +1,146 @@
+"""
+Unit tests for scenario query selection in the LangSmith dataset builder.
+
+DatasetBuilder._match_scenario_query replaced an if/elif chain over the
+scenario name. These tests pin it to that chain: the reference below is the
+original order, and every scenario script plus every pairing of keywords must
+pick the same scenario type and query.
+"""
+
+import itertools
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+# langsmith-experiments is a script directory, not a package
+sys.path.insert(0, str(ROOT / "langsmith-experiments"))
+
+dataset_builder = pytest.importorskip("dataset_builder")
+DatasetBuilder = dataset_builder.DatasetBuilder
+
+SCENARIOS_DIR = ROOT / "test-automation" / "scenarios"
+
+NAME_KEYWORDS = [
+    "imagepull", "crash", "service", "rbac", "cross-namespace", "oom", "probe", "network",
+    "permission", "configmap", "secret", "volume", "pvc", "resource", "limit", "dns", "ingress",
+]
+
+
+def reference_query(name: str, content: str, namespace: str):
+    """The if/elif chain _SCENARIO_QUERIES was built from, in its original order."""
+    if "imagepull" in name.lower():
+        query = f"In cluster kind, there's an issue with a pod in namespace {namespace}. The pod is showing ImagePullBackOff status. Please investigate and fix the issue."
+        scenario_type = "image_pull"
+    elif "crash" in name.lower():
+        query = f"In cluster kind, a pod in namespace {namespace} is in CrashLoopBackOff. Please diagnose the issue."
+        scenario_type = "crash_loop"
+    elif "service" in name.lower():
+        query = f"In cluster kind, the service in namespace {namespace} doesn't seem to be working. Traffic isn't reaching the pods. Please investigate."
+        scenario_type = "service_issue"
+    elif "rbac" in name.lower():
+        query = f"In cluster kind, a pod in namespace {namespace} is encountering authorization issues. Please diagnose and make recommendations."
+        scenario_type = "rbac"
+    elif "cross-namespace" in name.lower() or "namespace-a" in content:
+        query = "In cluster kind, there are connectivity issues between namespaces. Please investigate and identify the root cause."
+        scenario_type = "cross_namespace"
+    elif "oom" in name.lower():
+        query = f"In cluster kind, a pod in namespace {namespace} keeps getting OOMKilled. Please investigate and fix the issue."
+        scenario_type = "memory"
+    elif "probe" in name.lower():
+        query = f"In cluster kind, a pod in namespace {namespace} is failing its health checks. Please investigate."
+        scenario_type = "health_probe"
+    elif "network" in name.lower():
+        query = f"In cluster kind, there are network connectivity issues in namespace {namespace}. Please investigate."
+        scenario_type = "network"
+    elif "permission" in name.lower() or "rbac" in name.lower():
+        query = f"In cluster kind, a service account in namespace {namespace} is having permission issues. Please investigate."
+        scenario_type = "permissions"
+    elif "configmap" in name.lower():
+        query = f"In cluster kind, a pod in namespace {namespace} is having configuration issues. Please investigate."
+        scenario_type = "configuration"
+    elif "secret" in name.lower():
+        query = f"In cluster kind, a pod in namespace {namespace} is having issues with secrets. Please investigate."
+        scenario_type = "secrets"
+    elif "volume" in name.lower() or "pvc" in name.lower():
+        query = f"In cluster kind, a pod in namespace {namespace} is having volume mount issues. Please investigate."
+        scenario_type = "storage"
+    elif "resource" in name.lower() or "limit" in name.lower():
+        query = f"In cluster kind, a pod in namespace {namespace} is having resource constraint issues. Please investigate."
+        scenario_type = "resources"
+    elif "dns" in name.lower():
+        query = f"In cluster kind, there are DNS resolution issues in namespace {namespace}. Please investigate."
+        scenario_type = "dns"
+    elif "ingress" in name.lower():
+        query = f"In cluster kind, the ingress in namespace {namespace} is not working correctly. Please investigate."
+        scenario_type = "ingress"
+    else:
+        query = f"In cluster kind, there's an issue in namespace {namespace}. Please investigate and identify the root cause."
+        scenario_type = "general"
+    return scenario_type, query
+
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+
+@pytest.fixture
+def builder():
+    """A DatasetBuilder without the LangSmith client; matching needs none."""
+    return object.__new__(DatasetBuilder)
+
+
+def match(builder, name: str, content: str, namespace: str = "test-ns"):
+    scenario_type, query_template = builder._match_scenario_query(name.lower(), content)
+    return scenario_type, query_template.format(namespace=namespace)
+
+
+# =============================================================================
+# Matching Tests
+# =============================================================================
+
+
+class TestMatchScenarioQuery:
+    """Tests for DatasetBuilder._match_scenario_query."""
+
+    @pytest.mark.parametrize(
+        "script", sorted(SCENARIOS_DIR.glob("*.sh")), ids=lambda path: path.stem
+    )
+    def test_scenario_scripts(self, builder, script):
+        """Every shipped scenario gets the query the old chain gave it."""
+        content = script.read_text()
+        assert match(builder, script.stem, content) == reference_query(script.stem, content, "test-ns")
+
+    @pytest.mark.parametrize(
+        "first,second", list(itertools.product(NAME_KEYWORDS, repeat=2))
+    )
+    def test_keyword_pairs(self, builder, first, second):
+        """Whichever keyword comes first in the name, the earlier chain branch wins."""
+        name = f"01-{first}-{second}"
+        for content in ("", "kubectl create namespace namespace-a"):
+            assert match(builder, name, content) == reference_query(name, content, "test-ns")
+
+    @pytest.mark.parametrize("name", ["01-OOMKilled", "02-ImagePullBackOff", "03-Cross-Namespace"])
+    def test_name_case_ignored(self, builder, name):
+        assert match(builder, name, "") == reference_query(name, "", "test-ns")
+
+    def test_content_marker_outranks_later_keywords(self, builder):
+        """namespace-a in the script beats name keywords below cross_namespace."""
+        assert match(builder, "01-oomkilled", "namespace-a")[0] == "cross_namespace"
+
+    def test_content_marker_loses_to_earlier_keywords(self, builder):
+        """namespace-a in the script does not beat name keywords above cross_namespace."""
+        assert match(builder, "01-rbac-forbidden", "namespace-a")[0] == "rbac"
+
+    def test_overlapping_keywords(self, builder):
+        """Keywords overlapping in the name are all found."""
+        name = "01-crossnamespace-dnservice"
+        assert match(builder, name, "") == reference_query(name, "", "test-ns")
+
+    def test_no_keyword_is_general(self, builder):
+        assert match(builder, "09-init-container-failure", "", "ns-9") == reference_query(
+            "09-init-container-failure", "", "ns-9"
+        )
+        assert match(builder, "09-init-container-failure", "")[0] == "general"
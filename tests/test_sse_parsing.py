@@ -0,0 +1,120 @@
+"""
+Unit tests for the server-sent event line splitters used by the A2A clients.
+
+Tests cover:
+- LF and CRLF line endings
+- data lines split across network chunks
+- A final data line without a trailing newline
+- Non-data lines (event names, comments, blank separators)
+
+The same cases run against the test-automation copy of the splitter, which
+has to stay in step with the langsmith-experiments one.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Both directories are script collections, not packages
+sys.path.insert(0, os.path.join(ROOT, "langsmith-experiments"))
+sys.path.insert(0, os.path.join(ROOT, "test-automation"))
+
+integrated_experiment_runner = pytest.importorskip("integrated_experiment_runner")
+a2a_test_client = pytest.importorskip("a2a_test_client")
+
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+
+class FakeStreamResponse:
+    """Stands in for an httpx streaming response, yielding fixed chunks."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def aiter_bytes(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+@pytest.fixture(
+    params=[integrated_experiment_runner._aiter_sse_data, a2a_test_client._iter_sse_data],
+    ids=["integrated_experiment_runner", "a2a_test_client"],
+)
+def sse_data(request):
+    """Collect the payloads a splitter yields for a list of chunks."""
+    splitter = request.param
+
+    async def collect(chunks):
+        return [payload async for payload in splitter(FakeStreamResponse(chunks))]
+
+    return collect
+
+
+EVENT_1 = b'{"jsonrpc": "2.0", "result": {"kind": "status-update"}}'
+EVENT_2 = b'{"jsonrpc": "2.0", "result": {"kind": "artifact-update"}}'
+
+
+# =============================================================================
+# Splitter Tests
+# =============================================================================
+
+
+class TestSseSplitting:
+    """Tests for _aiter_sse_data and its test-automation copy."""
+
+    async def test_lf_lines(self, sse_data):
+        """Each data line yields its payload."""
+        stream = b"data: " + EVENT_1 + b"\n\ndata: " + EVENT_2 + b"\n\n"
+        assert await sse_data([stream]) == [EVENT_1, EVENT_2]
+
+    async def test_crlf_lines(self, sse_data):
+        """CRLF payloads keep the \\r, which JSON parsers skip as whitespace."""
+        stream = b"data: " + EVENT_1 + b"\r\n\r\ndata: " + EVENT_2 + b"\r\n\r\n"
+        payloads = await sse_data([stream])
+
+        assert payloads == [EVENT_1 + b"\r", EVENT_2 + b"\r"]
+        assert [json.loads(p) for p in payloads] == [json.loads(EVENT_1), json.loads(EVENT_2)]
+
+    async def test_line_split_across_chunks(self, sse_data):
+        """A data line arriving in pieces is yielded once, whole."""
+        stream = b"data: " + EVENT_1 + b"\n\ndata: " + EVENT_2 + b"\n\n"
+        chunks = [stream[i:i + 7] for i in range(0, len(stream), 7)]
+        assert await sse_data(chunks) == [EVENT_1, EVENT_2]
+
+    async def test_prefix_split_across_chunks(self, sse_data):
+        """The ``data: `` prefix itself may be split between chunks."""
+        assert await sse_data([b"da", b"ta", b": " + EVENT_1, b"\n"]) == [EVENT_1]
+
+    async def test_crlf_split_across_chunks(self, sse_data):
+        """A CRLF split between chunks still ends the line."""
+        chunks = [b"data: " + EVENT_1 + b"\r", b"\ndata: " + EVENT_2 + b"\r", b"\n"]
+        assert await sse_data(chunks) == [EVENT_1 + b"\r", EVENT_2 + b"\r"]
+
+    async def test_no_trailing_newline(self, sse_data):
+        """A final data line without a newline is still yielded."""
+        stream = b"data: " + EVENT_1 + b"\n\ndata: " + EVENT_2
+        assert await sse_data([stream]) == [EVENT_1, EVENT_2]
+
+    async def test_non_data_lines_skipped(self, sse_data):
+        """Event names, comments and blank lines yield nothing."""
+        stream = b": keep-alive\nevent: message\ndata: " + EVENT_1 + b"\nid: 1\n\n"
+        assert await sse_data([stream]) == [EVENT_1]
+
+    async def test_trailing_partial_non_data_line(self, sse_data):
+        """An unterminated non-data line at the end yields nothing."""
+        assert await sse_data([b"data: " + EVENT_1 + b"\nevent: mess"]) == [EVENT_1]
+
+    async def test_payloads_are_bytes(self, sse_data):
+        """Payloads are bytes, not views into the reused buffer."""
+        payloads = await sse_data([b"data: " + EVENT_1 + b"\n", b"data: " + EVENT_2 + b"\n"])
+        assert all(type(p) is bytes for p in payloads)
+        assert payloads == [EVENT_1, EVENT_2]
+
+    async def test_empty_stream(self, sse_data):
+        assert await sse_data([]) == []